@@ -0,0 +1,165 @@
+"""
+Admission Control
+Bounded concurrency and wait queues for chat requests, per project and per provider
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+
+
+CHATS_PER_PROJECT = 4  # Concurrent chats per project and traffic class
+QUEUED_PER_PROJECT = 16  # Chats waiting per project and traffic class
+PROVIDER_LIMITS = {"ollama": 2}  # Concurrent chats per provider (one local Ollama)
+DEFAULT_PROVIDER_LIMIT = 16  # Cloud providers
+QUEUE_TIMEOUT = 30  # Seconds a chat may wait for a slot
+API_SHARE = 0.5  # Fraction of the limits external API traffic ("api" class) gets
+
+
+class AdmissionRejected(Exception):
+    """A chat was turned away; retry after retry_after seconds"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class Gate:
+    """
+    Up to limit holders at once and up to max_queue waiters, served in
+    arrival order. Keeps a running average of how long holders take, to
+    estimate how long a rejected caller should wait.
+    """
+
+    def __init__(self, limit: int, max_queue: int):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.active = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.avg_seconds = 5.0  # Until real durations come in
+        self.rejected = 0
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free for a new caller"""
+        queued = len(self.waiters) + 1
+        return max(1, round(self.avg_seconds * queued / self.limit))
+
+    async def acquire(self, timeout: float):
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            return
+
+        if len(self.waiters) >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionRejected(429, "Too many chats waiting, try again shortly", self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            # The releasing holder hands its slot over by resolving the future
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # Slot arrived just as we gave up
+            else:
+                waiter.cancel()
+                self._discard(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.rejected += 1
+            raise AdmissionRejected(503, "Chat is busy, try again shortly", self.retry_after())
+
+    def release(self, seconds: Optional[float] = None):
+        if seconds is not None:
+            self.avg_seconds = 0.8 * self.avg_seconds + 0.2 * seconds
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _discard(self, waiter: asyncio.Future):
+        try:
+            self.waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def stats(self) -> Dict:
+        return {
+            "active": self.active,
+            "limit": self.limit,
+            "queued": len(self.waiters),
+            "max_queue": self.max_queue,
+            "avg_seconds": round(self.avg_seconds, 2),
+            "rejected": self.rejected
+        }
+
+
+class AdmissionController:
+    """
+    Admits chats through a per-project gate and then a per-provider gate,
+    each separate per traffic class, so external API traffic can't take
+    the slots the public chat widget needs. Use from the event loop only.
+    """
+
+    def __init__(self, per_project: int = CHATS_PER_PROJECT, queued: int = QUEUED_PER_PROJECT,
+                 provider_limits: Optional[Dict[str, int]] = None, timeout: float = QUEUE_TIMEOUT):
+        self.per_project = per_project
+        self.queued = queued
+        self.provider_limits = provider_limits if provider_limits is not None else dict(PROVIDER_LIMITS)
+        self.timeout = timeout
+        self._gates: Dict[Tuple[str, str, str], Gate] = {}
+
+    def _gate(self, kind: str, name: str, traffic_class: str) -> Gate:
+        key = (kind, name, traffic_class)
+        gate = self._gates.get(key)
+        if gate is None:
+            if kind == "project":
+                limit, max_queue = self.per_project, self.queued
+            else:
+                limit = self.provider_limits.get(name, DEFAULT_PROVIDER_LIMIT)
+                max_queue = limit * self.queued
+            if traffic_class == "api":
+                limit = max(1, int(limit * API_SHARE))
+                max_queue = max(1, int(max_queue * API_SHARE))
+            gate = self._gates[key] = Gate(limit, max_queue)
+        return gate
+
+    @asynccontextmanager
+    async def admit(self, project_id: str, provider: str, traffic_class: str = "public") -> AsyncIterator[None]:
+        """Hold a chat slot for the block; raises AdmissionRejected if none comes"""
+        provider = getattr(provider, "value", provider)  # AIProvider or plain string
+        deadline = time.monotonic() + self.timeout
+        project_gate = self._gate("project", project_id, traffic_class)
+        provider_gate = self._gate("provider", provider, traffic_class)
+
+        await project_gate.acquire(self.timeout)
+        try:
+            await provider_gate.acquire(max(deadline - time.monotonic(), 0.01))
+        except BaseException:
+            project_gate.release()
+            raise
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            seconds = time.monotonic() - started
+            provider_gate.release(seconds)
+            project_gate.release(seconds)
+
+    def forget_project(self, project_id: str):
+        """Drop a deleted project's idle gates"""
+        for key in [k for k in self._gates if k[0] == "project" and k[1] == project_id]:
+            gate = self._gates[key]
+            if not gate.active and not gate.waiters:
+                del self._gates[key]
+
+    def stats(self) -> Dict:
+        return {f"{kind}:{name}:{traffic_class}": gate.stats()
+                for (kind, name, traffic_class), gate in self._gates.items()}
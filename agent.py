@@ -3,12 +3,95 @@ AI Agent
 Main agent that handles chat with RAG (Retrieval-Augmented Generation)
 """
 
+import hashlib
 import os
-from typing import List, Dict, Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, TimeoutError as FutureTimeout, wait
+from typing import List, Dict, Optional, Set, Tuple
 from vector_store import VectorStore
+from chat_history import HistoryManager, estimate_tokens
+from llm_clients import get_llm_client
+from provider_health import provider_health
+from query_router import is_small_talk, route_query
 from models import ProjectConfig, ChatMessage
 
 
+# Config fields that require a new LLM client when changed. Generation
+# settings (model, temperature, limits) are read from config on each call.
+CLIENT_FIELDS = {"ai_provider", "api_key"}
+# Config fields the system prompt is built from
+PROMPT_FIELDS = {
+    "system_prompt", "project_name", "municipality_name",
+    "personality_traits", "tone", "community_constitution"
+}
+# Context sizes requested from Ollama. Ollama reloads the model whenever
+# num_ctx changes, so requests are rounded up to a few fixed sizes.
+NUM_CTX_BUCKETS = (2048, 4096, 8192, 16384, 32768)
+NUM_CTX_MARGIN = 1.1  # Headroom for the rough token estimate
+BASE_PROMPT_TOKENS = 1000  # System prompt plus a short question, no retrieved chunks
+NUM_CTX_RECENT = 8  # Requests a large context is kept for before shrinking back
+# Config fields that change the context size models are loaded with
+NUM_CTX_FIELDS = {"model_name", "fast_model_name", "max_tokens", "context_window"}
+
+HEDGE_MIN_DELAY = 2.0  # Never hedge sooner than this, however fast the model usually is
+
+# (provider, model_name, api_key)
+ModelTarget = Tuple[str, str, Optional[str]]
+
+
+def num_ctx_bucket(tokens: int, context_window: int) -> int:
+    """Smallest context bucket holding tokens, capped at context_window"""
+    for size in NUM_CTX_BUCKETS:
+        if size >= tokens:
+            return min(size, context_window)
+    return context_window
+
+
+def base_num_ctx(config: ProjectConfig) -> int:
+    """
+    Context bucket a short chat needs. Models are warmed with it and chats
+    never request less, so the shortest prompts don't reload them.
+    """
+    return num_ctx_bucket(BASE_PROMPT_TOKENS + config.max_tokens, config.context_window)
+
+
+def start_call(fn, *args) -> Future:
+    """
+    Run a model call that may be abandoned (timeouts, hedging) on its own
+    thread. A shared pool would let a hung provider's abandoned calls
+    queue the fallback behind them, and count the wait as its timeout.
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="llm", daemon=True).start()
+    return future
+
+
+def target_key(target: ModelTarget) -> str:
+    """Provider health key for a model target"""
+    return f"{target[0]}:{target[1]}"
+
+
+class ProviderError(Exception):
+    """A model call failed in a known way, with an answer to show the user"""
+
+    def __init__(self, code: str, answer: str, detail: Optional[str] = None):
+        super().__init__(detail or answer)
+        self.code = code
+        self.answer = answer
+        self.detail = detail
+
+
 class NeighborhoodAgent:
     """AI agent that answers questions using RAG"""
 
@@ -23,19 +106,57 @@ class NeighborhoodAgent:
                 collection_name=config.project_id
             )
         
-        # Initialize LLM client based on provider
+        self._system_prompt: Optional[str] = None
+        self.prompt_hash: Optional[str] = None
+        self.num_ctx = base_num_ctx(config)  # Ollama context of the latest request
+        self._recent_ctx = deque(maxlen=NUM_CTX_RECENT)  # Buckets the latest requests needed
+        self.route_counts = {"fast": 0, "strong": 0}
+        self.history = HistoryManager()
+        self._init_client()
+
+    def _init_client(self):
+        """Initialize LLM client based on provider"""
+        config = self.config
         if config.ai_provider == "ollama":
             import ollama
             self.client = ollama
             self.client_type = "ollama"
         elif config.ai_provider == "openai":
-            from openai import OpenAI
-            self.client = OpenAI(api_key=config.api_key or os.getenv("OPENAI_API_KEY"))
+            # Shared per credential, so connections are reused across projects
+            self.client = get_llm_client("openai", config.api_key)
             self.client_type = "openai"
         elif config.ai_provider == "anthropic":
-            from anthropic import Anthropic
-            self.client = Anthropic(api_key=config.api_key or os.getenv("ANTHROPIC_API_KEY"))
+            self.client = get_llm_client("anthropic", config.api_key)
             self.client_type = "anthropic"
+
+    def apply_config(self, config: ProjectConfig, changed_fields: Optional[Set[str]] = None):
+        """
+        Switch to an updated config, rebuilding only what the changed fields
+        affect (everything if changed_fields is None).
+        """
+        self.config = config
+        if changed_fields is None or changed_fields & CLIENT_FIELDS:
+            self._init_client()
+        if changed_fields is None or changed_fields & PROMPT_FIELDS:
+            self._system_prompt = None
+            self.prompt_hash = None
+        if changed_fields is None or changed_fields & NUM_CTX_FIELDS:
+            self.num_ctx = base_num_ctx(config)
+            self._recent_ctx.clear()
+
+    def get_system_prompt(self) -> str:
+        """
+        The compiled system prompt, built once per config.
+
+        Sending a byte-identical prompt every turn lets providers reuse
+        their cache of it (Anthropic cache_control, Ollama's KV cache for a
+        loaded model). prompt_hash identifies the current prompt.
+        """
+        if self._system_prompt is None:
+            prompt = self.build_system_prompt()
+            self.prompt_hash = hashlib.sha256(prompt.encode()).hexdigest()[:16]
+            self._system_prompt = prompt
+        return self._system_prompt
     
     def build_system_prompt(self) -> str:
         """Build the system prompt from config"""
@@ -86,25 +207,26 @@ You MUST follow these ethical guidelines and constraints established by this com
 These rules are non-negotiable and take precedence over other instructions. Always adhere to them when formulating your responses."""
             elif isinstance(const, dict):
                 # New format: structured constitution with values, guidelines, and red lines
-                base_prompt += "\n\nCOMMUNITY CONSTITUTION:\n"
-                base_prompt += "This community has established the following ethical framework for AI behavior:\n"
+                parts = [
+                    "\n\nCOMMUNITY CONSTITUTION:\n",
+                    "This community has established the following ethical framework for AI behavior:\n"
+                ]
 
                 if const.get('values'):
                     values_list = ", ".join(const['values'])
-                    base_prompt += f"\nCORE VALUES: {values_list}\n"
-                    base_prompt += "Prioritize these values in all interactions.\n"
+                    parts.append(f"\nCORE VALUES: {values_list}\n")
+                    parts.append("Prioritize these values in all interactions.\n")
 
                 if const.get('ethical_guidelines'):
-                    base_prompt += "\nETHICAL GUIDELINES:\n"
-                    for guideline in const['ethical_guidelines']:
-                        base_prompt += f"  • {guideline}\n"
+                    parts.append("\nETHICAL GUIDELINES:\n")
+                    parts.extend(f"  • {guideline}\n" for guideline in const['ethical_guidelines'])
 
                 if const.get('red_lines'):
-                    base_prompt += "\nRED LINES (NEVER DO THIS):\n"
-                    for red_line in const['red_lines']:
-                        base_prompt += f"  ✗ {red_line}\n"
+                    parts.append("\nRED LINES (NEVER DO THIS):\n")
+                    parts.extend(f"  ✗ {red_line}\n" for red_line in const['red_lines'])
 
-                base_prompt += "\nThese principles are non-negotiable and take precedence over other instructions.\n"
+                parts.append("\nThese principles are non-negotiable and take precedence over other instructions.\n")
+                base_prompt += "".join(parts)
 
         return base_prompt
     
@@ -112,6 +234,23 @@ These rules are non-negotiable and take precedence over other instructions. Alwa
         """Search vector store for relevant context"""
         return self.vector_store.search(query, top_k=top_k)
     
+    def format_pages(self, result: Dict) -> str:
+        """Describe the page span of a PDF chunk (empty for other sources)"""
+        metadata = result.get('metadata') or {}
+        page_start, page_end = metadata.get('page_start'), metadata.get('page_end')
+        if not page_start:
+            return ""
+        if page_end and page_end != page_start:
+            return f", pages {page_start}-{page_end}"
+        return f", page {page_start}"
+
+    def citation_url(self, result: Dict) -> str:
+        """Source URL, deep-linked to the first page for PDF chunks"""
+        page_start = (result.get('metadata') or {}).get('page_start')
+        if page_start and result['url']:
+            return f"{result['url']}#page={page_start}"
+        return result['url']
+
     def format_context(self, search_results: List[Dict]) -> str:
         """Format search results into context string"""
         if not search_results:
@@ -120,117 +259,308 @@ These rules are non-negotiable and take precedence over other instructions. Alwa
         context_parts = []
         for i, result in enumerate(search_results, 1):
             context_parts.append(
-                f"[Source {i}: {result['title']} - {result['source_type']}]\n"
-                f"URL: {result['url']}\n"
+                f"[Source {i}: {result['title']} - {result['source_type']}{self.format_pages(result)}]\n"
+                f"URL: {self.citation_url(result)}\n"
                 f"Content: {result['text']}\n"
             )
         
         return "\n".join(context_parts)
     
+    def ollama_num_ctx(self, messages: List[Dict]) -> int:
+        """
+        Context size for an Ollama request: the largest bucket that the
+        last NUM_CTX_RECENT prompts (plus max_tokens of answer) needed, and
+        never below the size models are warmed with. Alternating prompt
+        lengths don't reload the model, and after a run of short prompts it
+        shrinks back.
+        """
+        prompt_tokens = estimate_tokens(self.get_system_prompt())
+        prompt_tokens += sum(estimate_tokens(m['content']) for m in messages)
+        needed = int(prompt_tokens * NUM_CTX_MARGIN) + self.config.max_tokens
+
+        self._recent_ctx.append(num_ctx_bucket(needed, self.config.context_window))
+        self.num_ctx = min(max(base_num_ctx(self.config), *list(self._recent_ctx)), self.config.context_window)
+        return self.num_ctx
+
+    def model_targets(self, route: str = "strong") -> List[ModelTarget]:
+        """
+        The project's model followed by its fallbacks; on the fast route,
+        the fast model goes first with the project's model as its fallback.
+        """
+        provider = getattr(self.config.ai_provider, "value", self.config.ai_provider)
+        targets = [(provider, self.config.model_name, self.config.api_key)]
+        if route == "fast" and self.config.fast_model_name:
+            targets.insert(0, (provider, self.config.fast_model_name, self.config.api_key))
+        for fallback in self.config.fallback_models:
+            targets.append((getattr(fallback.ai_provider, "value", fallback.ai_provider),
+                            fallback.model_name, fallback.api_key))
+        return targets
+
+    def generate(self, messages: List[Dict], route: str = "strong") -> Tuple[str, ModelTarget]:
+        """
+        Answer with the first model target that succeeds in time. Targets
+        whose circuit is open are skipped; with hedge_requests, the next
+        target is also asked once a call runs past its usual p95 latency.
+        Without fallbacks the project's model is called directly.
+        """
+        targets = self.model_targets(route)
+        if len(targets) == 1:
+            return self._call(targets[0], messages), targets[0]
+
+        first_error: Optional[Exception] = None
+        tried = set()
+        for i, target in enumerate(targets):
+            if target in tried or not provider_health.allow(target_key(target)):
+                continue
+            tried.add(target)
+
+            backup = targets[i + 1] if i + 1 < len(targets) else None
+            try:
+                if self.config.hedge_requests and backup and backup not in tried:
+                    answer, used = self._hedged_call(target, backup, messages, tried)
+                    return answer, used
+                return self._timed_call(target, messages), target
+            except FutureTimeout:
+                print(f"Model {target_key(target)} timed out")
+                first_error = first_error or ProviderError(
+                    'model_timeout', "The AI model took too long to respond. Please try again."
+                )
+            except Exception as e:
+                print(f"Model {target_key(target)} failed: {e}")
+                first_error = first_error or e
+
+        raise first_error or ProviderError(
+            'models_unavailable',
+            "The AI models for this project are temporarily unavailable. Please try again shortly."
+        )
+
+    def log_route(self, route: str, reason: str, target: ModelTarget, seconds: float):
+        """Log a routing decision and the time saved against the strong model's average"""
+        saved = ""
+        strong_avg = provider_health.average(target_key(self.model_targets()[0]))
+        if route == "fast" and target[1] == self.config.fast_model_name and strong_avg:
+            saved = f", ~{strong_avg - seconds:.1f}s faster than {self.config.model_name}"
+        print(f"Routed {self.config.project_id} to {route} model {target[1]} ({reason}): {seconds:.1f}s{saved}")
+
+    def _timed_call(self, target: ModelTarget, messages: List[Dict]) -> str:
+        """Call a target, giving up after provider_timeout"""
+        abandoned = threading.Event()
+        future = start_call(self._call, target, messages, abandoned)
+        try:
+            return future.result(timeout=self.config.provider_timeout)
+        except FutureTimeout:
+            self._abandon(target, abandoned)
+            raise
+
+    def _hedged_call(self, target: ModelTarget, backup: ModelTarget, messages: List[Dict],
+                     tried: Set) -> Tuple[str, ModelTarget]:
+        """Call target; if it runs past its p95, race it against backup"""
+        p95 = provider_health.p95(target_key(target))
+        if p95 is None:
+            return self._timed_call(target, messages), target
+
+        deadline = time.monotonic() + self.config.provider_timeout
+        abandoned = {target: threading.Event(), backup: threading.Event()}
+        futures = {start_call(self._call, target, messages, abandoned[target]): target}
+        done, _ = wait(futures, timeout=min(max(p95, HEDGE_MIN_DELAY), self.config.provider_timeout))
+        if not done and provider_health.allow(target_key(backup)):
+            print(f"Hedging {target_key(target)} with {target_key(backup)} (p95 {p95:.1f}s)")
+            tried.add(backup)
+            futures[start_call(self._call, backup, messages, abandoned[backup])] = backup
+
+        error: Optional[Exception] = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    # The loser was slower, not broken: leave it out of its stats
+                    for other in pending:
+                        self._abandon(futures[other], abandoned[futures[other]], timed_out=False)
+                    return future.result(), futures[future]
+                error = error or future.exception()
+
+        for future in pending:
+            self._abandon(futures[future], abandoned[futures[future]])
+        raise error or FutureTimeout()
+
+    def _abandon(self, target: ModelTarget, abandoned: threading.Event, timed_out: bool = True):
+        """
+        Stop tracking a call we no longer wait for. A call that ran past
+        provider_timeout counts as a failure; a hedge loser is not recorded.
+        """
+        abandoned.set()
+        if timed_out:
+            provider_health.record(target_key(target), self.config.provider_timeout, ok=False)
+
+    def _call(self, target: ModelTarget, messages: List[Dict],
+              abandoned: Optional[threading.Event] = None) -> str:
+        """Call one model target, recording its latency and outcome"""
+        key = target_key(target)
+        started = time.monotonic()
+        call_id = provider_health.begin(key)
+        ok = False
+        try:
+            answer = self._generate(target, messages)
+            ok = True
+            return answer
+        finally:
+            provider_health.end(key, call_id)
+            if abandoned is None or not abandoned.is_set():
+                provider_health.record(key, time.monotonic() - started, ok)
+
+    def _client_for(self, provider: str, api_key: Optional[str]):
+        if provider == self.client_type and api_key == self.config.api_key:
+            return self.client
+        if provider == "ollama":
+            import ollama
+            return ollama
+        return get_llm_client(provider, api_key)
+
+    def _generate(self, target: ModelTarget, messages: List[Dict]) -> str:
+        """One model call; raises ProviderError for known failures"""
+        provider, model_name, api_key = target
+        client = self._client_for(provider, api_key)
+
+        if provider == "ollama":
+            try:
+                response = client.chat(
+                    model=model_name,
+                    messages=[
+                        {"role": "system", "content": self.get_system_prompt()},
+                        *messages
+                    ],
+                    options={
+                        "temperature": self.config.temperature,
+                        "num_ctx": self.ollama_num_ctx(messages),
+                        "num_predict": self.config.max_tokens
+                    },
+                    keep_alive=self.config.keep_alive
+                )
+                return response['message']['content']
+            except Exception as ollama_error:
+                error_msg = str(ollama_error).lower()
+                if "connection" in error_msg or "refused" in error_msg:
+                    raise ProviderError(
+                        'ollama_not_running',
+                        "Ollama is not running. Please start Ollama with `ollama serve` in your terminal, then try again.",
+                        str(ollama_error)
+                    )
+                elif "not found" in error_msg or "pull" in error_msg:
+                    raise ProviderError(
+                        'model_not_found',
+                        f"The model '{model_name}' is not installed. Run `ollama pull {model_name}` to install it.",
+                        str(ollama_error)
+                    )
+                raise
+
+        elif provider == "openai":
+            if not api_key and not os.getenv("OPENAI_API_KEY"):
+                raise ProviderError(
+                    'missing_api_key',
+                    "OpenAI API key is not configured. Please add your API key in Settings."
+                )
+            response = client.chat.completions.create(
+                model=model_name,
+                messages=[
+                    {"role": "system", "content": self.get_system_prompt()},
+                    *messages
+                ],
+                temperature=self.config.temperature,
+                max_tokens=self.config.max_tokens
+            )
+            return response.choices[0].message.content
+
+        elif provider == "anthropic":
+            if not api_key and not os.getenv("ANTHROPIC_API_KEY"):
+                raise ProviderError(
+                    'missing_api_key',
+                    "Anthropic API key is not configured. Please add your API key in Settings."
+                )
+            # Anthropic doesn't use system message in messages array;
+            # mark the (constant) system prompt as a cacheable prefix
+            response = client.messages.create(
+                model=model_name,
+                max_tokens=self.config.max_tokens,
+                temperature=self.config.temperature,
+                system=[{
+                    "type": "text",
+                    "text": self.get_system_prompt(),
+                    "cache_control": {"type": "ephemeral"}
+                }],
+                messages=messages
+            )
+            return response.content[0].text
+
+        raise ValueError(f"Unknown AI provider: {provider}")
+
     def chat(self, 
              message: str, 
              conversation_history: Optional[List[ChatMessage]] = None) -> Dict:
         """Main chat method with RAG"""
         
-        # Search for relevant context
-        search_results = self.search_knowledge(message, top_k=5)
-        context = self.format_context(search_results)
+        # Search for relevant context, unless the message is small talk;
+        # chunks below the project's score floor are dropped
+        small_talk = is_small_talk(message)
+        if small_talk:
+            search_results = []
+            retrieval = {'decision': 'skipped', 'reason': 'small talk'}
+        else:
+            found = self.search_knowledge(message, top_k=5)
+            search_results = [r for r in found if r['score'] >= self.config.retrieval_min_score]
+            retrieval = {
+                'decision': 'searched',
+                'kept': len(search_results),
+                'dropped': len(found) - len(search_results)
+            }
         
-        # Build the prompt
-        user_prompt = f"""Context from {self.config.municipality_name} sources:
+        # Recent turns verbatim within the history budget, older ones summarized
+        messages, earlier_summary = self.history.compact(
+            conversation_history or [], self.config.history_token_budget
+        )
+
+        # Build the prompt (the summary goes here, not in the system prompt,
+        # so the system prompt stays identical across turns)
+        summary_block = ""
+        if earlier_summary:
+            summary_block = f"Earlier in this conversation:\n{earlier_summary}\n\n"
+
+        if small_talk:
+            user_prompt = f"""{summary_block}User: {message}
 
-{context}
+Reply briefly and naturally, and offer to help with questions about {self.config.municipality_name}."""
+        else:
+            user_prompt = f"""{summary_block}Context from {self.config.municipality_name} sources:
+
+{self.format_context(search_results)}
 
 User Question: {message}
 
 Please provide a helpful answer based on the context above. If you reference specific information, mention which source it comes from."""
 
-        # Prepare conversation
-        messages = []
-        
-        # Add conversation history if provided
-        if conversation_history:
-            for msg in conversation_history[-5:]:  # Last 5 messages for context
-                messages.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
-        
         # Add current message
         messages.append({
             "role": "user",
             "content": user_prompt
         })
         
-        # Get response from LLM
+        # Simple lookups go to the fast model, if the project has one
+        route = "strong"
+        if self.config.fast_model_name:
+            if small_talk:
+                route, reason = "fast", "small talk"
+            else:
+                route, reason = route_query(message, search_results, conversation_history)
+            self.route_counts[route] += 1
+
+        # Get response from LLM (failing over to fallback models if configured)
         try:
-            if self.client_type == "ollama":
-                try:
-                    response = self.client.chat(
-                        model=self.config.model_name,
-                        messages=[
-                            {"role": "system", "content": self.build_system_prompt()},
-                            *messages
-                        ],
-                        options={
-                            "temperature": self.config.temperature,
-                            "num_ctx": self.config.context_window
-                        }
-                    )
-                    answer = response['message']['content']
-                except Exception as ollama_error:
-                    error_msg = str(ollama_error).lower()
-                    if "connection" in error_msg or "refused" in error_msg:
-                        return {
-                            'answer': "Ollama is not running. Please start Ollama with `ollama serve` in your terminal, then try again.",
-                            'sources': [],
-                            'error': 'ollama_not_running',
-                            'error_detail': str(ollama_error)
-                        }
-                    elif "not found" in error_msg or "pull" in error_msg:
-                        return {
-                            'answer': f"The model '{self.config.model_name}' is not installed. Run `ollama pull {self.config.model_name}` to install it.",
-                            'sources': [],
-                            'error': 'model_not_found',
-                            'error_detail': str(ollama_error)
-                        }
-                    else:
-                        raise ollama_error
-
-            elif self.client_type == "openai":
-                if not self.config.api_key and not os.getenv("OPENAI_API_KEY"):
-                    return {
-                        'answer': "OpenAI API key is not configured. Please add your API key in Settings.",
-                        'sources': [],
-                        'error': 'missing_api_key'
-                    }
-                response = self.client.chat.completions.create(
-                    model=self.config.model_name,
-                    messages=[
-                        {"role": "system", "content": self.build_system_prompt()},
-                        *messages
-                    ],
-                    temperature=self.config.temperature,
-                    max_tokens=self.config.max_tokens
-                )
-                answer = response.choices[0].message.content
-
-            elif self.client_type == "anthropic":
-                if not self.config.api_key and not os.getenv("ANTHROPIC_API_KEY"):
-                    return {
-                        'answer': "Anthropic API key is not configured. Please add your API key in Settings.",
-                        'sources': [],
-                        'error': 'missing_api_key'
-                    }
-                # Anthropic doesn't use system message in messages array
-                response = self.client.messages.create(
-                    model=self.config.model_name,
-                    max_tokens=self.config.max_tokens,
-                    temperature=self.config.temperature,
-                    system=self.build_system_prompt(),
-                    messages=messages
-                )
-                answer = response.content[0].text
+            started = time.monotonic()
+            answer, target = self.generate(messages, route)
+            if self.config.fast_model_name:
+                self.log_route(route, reason, target, time.monotonic() - started)
 
             # Format sources for response
             sources = []
@@ -238,7 +568,7 @@ Please provide a helpful answer based on the context above. If you reference spe
                 sources = [
                     {
                         'title': r['title'],
-                        'url': r['url'],
+                        'url': self.citation_url(r),
                         'source_type': r['source_type'],
                         'relevance_score': round(r['score'], 3)
                     }
@@ -248,9 +578,18 @@ Please provide a helpful answer based on the context above. If you reference spe
             return {
                 'answer': answer,
                 'sources': sources,
-                'context_used': len(search_results) > 0
+                'context_used': len(search_results) > 0,
+                'model': target[1],
+                'route': route,
+                'retrieval': retrieval,
+                'fallback_used': target != self.model_targets(route)[0]
             }
 
+        except ProviderError as e:
+            response = {'answer': e.answer, 'sources': [], 'error': e.code}
+            if e.detail:
+                response['error_detail'] = e.detail
+            return response
         except Exception as e:
             error_msg = str(e)
             # Provide more helpful error messages
@@ -278,6 +617,9 @@ Please provide a helpful answer based on the context above. If you reference spe
             'municipality': self.config.municipality_name,
             'ai_provider': self.config.ai_provider,
             'model': self.config.model_name,
+            'prompt_hash': self.prompt_hash,
+            'num_ctx': self.num_ctx,
+            'routes': dict(self.route_counts),
             'total_documents': vector_stats.get('total_documents', 0),
             'data_sources': len(self.config.data_sources),
             'active_sources': len([s for s in self.config.data_sources if s.enabled])
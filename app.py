@@ -3,25 +3,41 @@ Main FastAPI Application
 Serves the Neighborhood AI backend API
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from typing import List, Optional, Dict
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import List, Optional, Dict, Set
+import asyncio
+import base64
 import json
 import os
+import secrets
 import uuid
+from contextlib import ExitStack
 from datetime import datetime
 
 from models import (
-    ProjectConfig, DataSource, ChatRequest, ChatMessage,
+    ProjectConfig, DataSource, ChatRequest, ApiChatRequest, ChatMessage,
     DataIngestionJob, AIProvider, DataSourceType
 )
 from agent import NeighborhoodAgent
-from vector_store import VectorStore
+from vector_store import VectorStore, get_qdrant_client, close_qdrant_client, ensure_payload_indexes, qdrant_clients
+from project_stats import ProjectStats
+from provider_status import ProviderStatus
+from provider_health import provider_health
+from model_residency import ModelResidency
+from job_events import JobEventBus
+from project_store import ProjectRepository, atomic_write
+from resource_manager import ResourceManager, ResourceCache
+from chat_sessions import SessionStore
+from single_flight import SingleFlight, normalize_message
+from admission import AdmissionController, AdmissionRejected
+from upload_limit import UploadSizeLimit
+import llm_clients
 from collectors.youtube_collector import YouTubeCollector
 from collectors.website_collector import WebsiteCollector
-from collectors.pdf_collector import PDFCollector
+from collectors.pdf_collector import PDFCollector, MAX_PDF_BYTES, DOWNLOAD_CHUNK_SIZE, shutdown_worker_pool
 from collectors.source_discovery import SourceDiscovery
 
 # Try to import advanced scraper (requires playwright)
@@ -39,7 +55,10 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# CORS middleware
+# Turn away oversized PDF uploads before their bodies are spooled to disk
+app.add_middleware(UploadSizeLimit, max_bytes=MAX_PDF_BYTES, path_suffixes=("/upload-pdf",))
+
+# CORS middleware (added last, so it also wraps the limit's 413s)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -53,10 +72,40 @@ app.add_middleware(
 )
 
 # In-memory storage (use database in production)
-projects: Dict[str, ProjectConfig] = {}
+project_repo = ProjectRepository()  # Atomic, coalesced config.json writes and the project catalog
+projects: Dict[str, ProjectConfig] = project_repo.projects
 ingestion_jobs: Dict[str, DataIngestionJob] = {}
-agents: Dict[str, NeighborhoodAgent] = {}
-vector_stores: Dict[str, VectorStore] = {}  # Cache to avoid Qdrant locking issues
+
+# Per-project agents and vector stores are bounded: least recently used
+# and idle projects are evicted, closing their Qdrant clients
+MAX_CACHED_PROJECTS = int(os.getenv("MAX_CACHED_PROJECTS", "8"))
+PROJECT_IDLE_TTL = int(os.getenv("PROJECT_IDLE_TTL", "1800"))
+
+
+def release_vector_store(project_id: str, vector_store: VectorStore):
+    """Evict a project's vector store along with the agent that searches it"""
+    agents.pop(project_id)
+    vector_store.close()
+
+
+resources = ResourceManager()
+agents = resources.register(ResourceCache("agents", MAX_CACHED_PROJECTS, PROJECT_IDLE_TTL))
+vector_stores = resources.register(ResourceCache(
+    "vector_stores", MAX_CACHED_PROJECTS, PROJECT_IDLE_TTL, on_evict=release_vector_store
+))
+resources.register(qdrant_clients)
+
+# Chat history lives server-side; set CHAT_SESSIONS_DB to persist it to SQLite
+chat_sessions = SessionStore(db_path=os.getenv("CHAT_SESSIONS_DB"))
+resources.register(chat_sessions.sessions)
+# Identical opening questions asked at once share one answer
+chat_flights = SingleFlight()
+# Bounded concurrency and queues for chats, per project and per provider
+admission = AdmissionController()
+project_stats = ProjectStats()  # Counters served by /stats and /health
+provider_status = ProviderStatus()  # Refreshed in the background
+residency = ModelResidency(provider_status)  # Keeps configured Ollama models loaded
+job_events = JobEventBus()  # Pushes job progress to SSE subscribers
 
 
 # Helper functions
@@ -74,48 +123,159 @@ def save_project(project: ProjectConfig):
     os.makedirs(f"{path}/qdrant", exist_ok=True)
     os.makedirs(f"{path}/uploads", exist_ok=True)
 
-    with open(f"{path}/config.json", 'w') as f:
-        json.dump(project.model_dump(), f, indent=2, default=str)
+    project_repo.save(project)
+    project_stats.update_sources(project)
 
-    projects[project.project_id] = project
+
+def modify_project(project_id: str, fn) -> Optional[ProjectConfig]:
+    """Apply fn to the current project under its lock and save it"""
+    project = project_repo.update(project_id, fn)
+    if project:
+        project_stats.update_sources(project)
+    return project
 
 
 def load_project(project_id: str) -> Optional[ProjectConfig]:
     """Load project from disk"""
-    if project_id in projects:
-        return projects[project_id]
-    
-    path = f"./data/{project_id}/config.json"
-    if os.path.exists(path):
-        with open(path, 'r') as f:
-            data = json.load(f)
-            project = ProjectConfig(**data)
-            projects[project_id] = project
-            return project
-    
-    return None
+    return project_repo.get(project_id)
+
+
+def open_vector_store(project_id: str) -> VectorStore:
+    """Create a project's vector store (use through the vector_stores cache)"""
+    return VectorStore(
+        path=f"./data/{project_id}/qdrant",
+        collection_name=project_id
+    )
+
+
+def use_vector_store(project_id: str):
+    """Pin a project's shared vector store for a with-block"""
+    return vector_stores.use(project_id, lambda: open_vector_store(project_id))
 
 
 def get_or_create_agent(project_id: str) -> NeighborhoodAgent:
     """Get or create agent for a project"""
-    if project_id in agents:
-        return agents[project_id]
+    agent = agents.get(project_id)
+    if agent:
+        return agent
 
     project = load_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    # Get or create shared vector store
-    if project_id not in vector_stores:
-        vector_stores[project_id] = VectorStore(
-            path=f"./data/{project_id}/qdrant",
-            collection_name=project_id
-        )
-
     # Create agent with shared vector store
-    agent = NeighborhoodAgent(project, vector_store=vector_stores[project_id])
-    agents[project_id] = agent
-    return agent
+    vector_store = vector_stores.get_or_create(project_id, lambda: open_vector_store(project_id))
+    return agents.get_or_create(project_id, lambda: NeighborhoodAgent(project, vector_store=vector_store))
+
+
+# Config fields that locate a project's vector store; changing them needs a
+# new store. Everything else is applied to the cached agent in place.
+STORAGE_FIELDS = {"project_id"}
+# Config fields that change which models Ollama holds in memory, or how
+RESIDENCY_FIELDS = {"ai_provider", "model_name", "fast_model_name", "keep_alive", "max_tokens", "context_window"}
+
+
+def changed_config_fields(before: Dict, after: ProjectConfig) -> Set[str]:
+    """Names of config fields that differ between a model_dump and a config"""
+    after_dump = after.model_dump()
+    return {key for key, value in after_dump.items() if before.get(key) != value}
+
+
+def refresh_project_caches(project_id: str, project: ProjectConfig, changed: Set[str]):
+    """Bring the cached agent and vector store up to date after a config change"""
+    if changed & RESIDENCY_FIELDS:
+        residency.warm_project(project)
+
+    if changed & STORAGE_FIELDS:
+        agents.pop(project_id)
+        vector_stores.pop(project_id)
+        return
+
+    agent = agents.get(project_id)
+    if agent:
+        try:
+            agent.apply_config(project, changed)
+        except Exception as e:
+            # e.g. a provider switch without a key; rebuilt on next chat
+            print(f"Could not update agent for {project_id}: {e}")
+            agents.pop(project_id)
+
+
+def harvest_index_path(project_id: str, source_id: str) -> str:
+    """Where a PDF site source's URL -> content entries are kept (outside config.json)"""
+    return f"{get_project_path(project_id)}/harvest/{source_id}.json"
+
+
+def load_harvest_index(project_id: str, source_id: str) -> Dict[str, Dict]:
+    """A PDF site source's harvest index ({} before its first sync)"""
+    try:
+        with open(harvest_index_path(project_id, source_id)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_harvest_index(project_id: str, source_id: str, index: Dict[str, Dict]):
+    path = harvest_index_path(project_id, source_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write(path, json.dumps(index))
+
+
+def build_pdf_documents(file_path: str, source: DataSource, collection_method: str,
+                        vector_store: VectorStore, url: Optional[str] = None,
+                        progress_callback=None) -> tuple[List[Dict], Dict]:
+    """Chunk a PDF page by page into documents tagged with their page span"""
+    collector = PDFCollector()
+    info = collector.read_info(file_path)
+    word_count = 0
+
+    def counted_pages():
+        nonlocal word_count
+        for page in collector.iter_pages(file_path, progress_callback=progress_callback):
+            word_count += page['word_count']
+            yield page
+
+    documents = []
+    for chunk in vector_store.chunk_pages(counted_pages()):
+        documents.append({
+            'text': chunk['text'],
+            'metadata': {
+                'source': source.name,
+                'source_type': 'pdf',
+                'collection_method': collection_method,
+                'url': url or source.url,
+                'title': info['title'],
+                'date': '',
+                'page_start': chunk['page_start'],
+                'page_end': chunk['page_end'],
+                'page_count': info['num_pages']
+            }
+        })
+
+    info['word_count'] = word_count
+    return documents, info
+
+
+@app.on_event("startup")
+async def start_background_services():
+    """Start background refresh of provider status and the job event bus"""
+    provider_status.start()
+    resources.start()
+    job_events.bind(asyncio.get_running_loop())
+    residency.start_task(residency.warm_projects(load_all_projects))
+
+
+@app.on_event("shutdown")
+async def stop_background_services():
+    """Stop background services"""
+    await provider_status.stop()
+    await resources.stop()
+    project_repo.flush()
+    vector_stores.clear()
+    qdrant_clients.clear()
+    chat_sessions.close()
+    llm_clients.close_all()
+    shutdown_worker_pool()
 
 
 # API Routes
@@ -159,29 +319,33 @@ async def create_project(
     }
 
 
+def load_all_projects() -> List[ProjectConfig]:
+    """Load every cataloged project into the cache"""
+    loaded = (load_project(entry['project_id']) for entry in project_repo.catalog())
+    return [project for project in loaded if project]
+
+
 @app.get("/api/projects")
 async def list_projects():
-    """List all projects"""
-    # Load all projects from disk
-    if os.path.exists("./data"):
-        for folder in os.listdir("./data"):
-            project_id = folder
-            if project_id not in projects:
-                load_project(project_id)
-    
+    """List all projects (from the catalog, without loading configs)"""
     return {
-        "projects": [
-            {
-                "project_id": p.project_id,
-                "municipality_name": p.municipality_name,
-                "project_name": p.project_name,
-                "created_at": p.created_at.isoformat() if isinstance(p.created_at, datetime) else p.created_at
-            }
-            for p in projects.values()
-        ]
+        "projects": project_repo.catalog()
     }
 
 
+@app.get("/api/projects/health")
+async def all_projects_health():
+    """List all projects with their health in one request (landing page)"""
+    def collect() -> Dict:
+        # A cold cache parses every config and opens Qdrant clients
+        return {
+            "projects": project_repo.catalog(),
+            "health": {p.project_id: build_project_health(p) for p in load_all_projects()}
+        }
+
+    return await asyncio.to_thread(collect)
+
+
 @app.get("/api/projects/{project_id}")
 async def get_project(project_id: str):
     """Get project details"""
@@ -199,19 +363,24 @@ async def update_project(project_id: str, updates: Dict):
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    # Update fields
-    for key, value in updates.items():
-        if hasattr(project, key):
-            setattr(project, key, value)
+    # Validate the updated config as a whole, so nested fields (e.g.
+    # fallback_models) are stored as models rather than raw dicts
+    before = project.model_dump()
+    updates = {key: value for key, value in updates.items() if key in ProjectConfig.model_fields}
+    try:
+        validated = ProjectConfig.model_validate({**before, **updates})
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid project configuration: {e}")
 
-    project.updated_at = datetime.now()
-    save_project(project)
+    def apply_updates(p: ProjectConfig):
+        for key in updates:
+            setattr(p, key, getattr(validated, key))
+        p.updated_at = datetime.now()
+
+    project = modify_project(project_id, apply_updates)
 
-    # Invalidate caches
-    if project_id in agents:
-        del agents[project_id]
-    if project_id in vector_stores:
-        del vector_stores[project_id]
+    # Rebuild only what the changed fields affect (branding touches nothing)
+    refresh_project_caches(project_id, project, changed_config_fields(before, project))
 
     return {"message": "Project updated successfully"}
 
@@ -225,13 +394,14 @@ async def delete_project(project_id: str):
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    # Remove from memory caches
-    if project_id in projects:
-        del projects[project_id]
-    if project_id in agents:
-        del agents[project_id]
-    if project_id in vector_stores:
-        del vector_stores[project_id]
+    # Remove from memory caches (drops any pending config write) and
+    # close the Qdrant client before its files are removed
+    project_repo.remove(project_id)
+    agents.pop(project_id)
+    vector_stores.pop(project_id)
+    close_qdrant_client(f"./data/{project_id}/qdrant")
+    admission.forget_project(project_id)
+    project_stats.remove(project_id)
 
     # Remove project data directory
     project_path = get_project_path(project_id)
@@ -277,8 +447,7 @@ async def add_data_source(project_id: str, source: DataSource):
     if not source.id:
         source.id = str(uuid.uuid4())
     
-    project.data_sources.append(source)
-    save_project(project)
+    modify_project(project_id, lambda p: p.data_sources.append(source))
     
     return {"message": "Data source added", "source_id": source.id}
 
@@ -290,17 +459,23 @@ async def remove_data_source(project_id: str, source_id: str):
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    project.data_sources = [s for s in project.data_sources if s.id != source_id]
-    save_project(project)
+    def remove_source(p: ProjectConfig):
+        p.data_sources = [s for s in p.data_sources if s.id != source_id]
+
+    modify_project(project_id, remove_source)
+    if os.path.exists(harvest_index_path(project_id, source_id)):
+        os.remove(harvest_index_path(project_id, source_id))
     
     return {"message": "Data source removed"}
 
 
-async def ingest_source_background(job: DataIngestionJob, project: ProjectConfig):
+def ingest_source_background(job: DataIngestionJob, project: ProjectConfig):
     """Background task for data ingestion"""
     ingestion_jobs[job.job_id] = job
     job.status = "running"
     job.started_at = datetime.now()
+    job_events.publish(job)
+    pinned = ExitStack()
     
     try:
         # Find the source
@@ -310,15 +485,13 @@ async def ingest_source_background(job: DataIngestionJob, project: ProjectConfig
             job.error = "Source not found"
             return
         
-        # Get or create vector store (cached to avoid locking issues)
-        if project.project_id not in vector_stores:
-            vector_stores[project.project_id] = VectorStore(
-                path=f"./data/{project.project_id}/qdrant",
-                collection_name=project.project_id
-            )
-        vector_store = vector_stores[project.project_id]
+        # Get or create vector store (cached to avoid locking issues),
+        # pinned for the whole job
+        vector_store = pinned.enter_context(use_vector_store(project.project_id))
         
         documents = []
+        streamed_chunks = 0  # Chunks already indexed by sources that stream
+        streamed_words = 0
         
         # Collect data based on source type
         collection_method = "unknown"
@@ -331,6 +504,7 @@ async def ingest_source_background(job: DataIngestionJob, project: ProjectConfig
                 job.processed_items = current
                 job.total_items = total
                 job.progress = (current / total) * 100 if total > 0 else 0
+                job_events.publish(job)
 
             results = collector.collect_playlist(source.url, progress_callback=progress)
 
@@ -396,6 +570,7 @@ async def ingest_source_background(job: DataIngestionJob, project: ProjectConfig
                 job.processed_items = current
                 job.total_items = total
                 job.progress = (current / total) * 100 if total > 0 else 0
+                job_events.publish(job)
 
             results = collector.crawl_website(source.url, max_pages=50, progress_callback=progress)
 
@@ -418,55 +593,114 @@ async def ingest_source_background(job: DataIngestionJob, project: ProjectConfig
         elif source.type == DataSourceType.PDF_URL:
             collection_method = "pdf_url_download"
             collector = PDFCollector()
-            pdf_data = collector.extract_from_url(source.url)
+            pdf_path = collector.download_to_file(source.url)
+            job.total_items = 1
 
-            if pdf_data:
-                job.total_items = 1
-                # Chunk PDF text
-                chunks = vector_store.chunk_text(pdf_data['full_text'])
-                for chunk in chunks:
-                    documents.append({
-                        'text': chunk,
-                        'metadata': {
-                            'source': source.name,
-                            'source_type': 'pdf',
-                            'collection_method': collection_method,
-                            'url': source.url,
-                            'title': pdf_data['title'],
-                            'date': ''
-                        }
-                    })
-                job.processed_items = 1
+            def progress(current, total):
+                job.progress = (current / total) * 50 if total > 0 else 0
+                job_events.publish(job)
+
+            try:
+                documents, pdf_info = build_pdf_documents(
+                    pdf_path, source, collection_method, vector_store, progress_callback=progress
+                )
+            finally:
+                os.remove(pdf_path)
+            job.processed_items = 1
+            # Count the PDF's words, not its (overlapping) chunks'
+            streamed_words = pdf_info['word_count']
+
+        elif source.type == DataSourceType.PDF_SITE:
+            collection_method = "pdf_site_harvest"
+            collector = PDFCollector()
+
+            def discovery_progress(current, total, pdfs_found):
+                job.progress = (current / total) * 10 if total > 0 else 0
+                job_events.publish(job)
+
+            pdf_urls = collector.discover_pdf_links(source.url, progress_callback=discovery_progress)
+            job.total_items = len(pdf_urls)
+
+            # Skip PDFs that are unchanged, or whose content was ingested, since
+            # an earlier sync. Configs from before the harvest index kept bare
+            # content hashes; they still count as known.
+            harvest_index = load_harvest_index(project.project_id, source.id)
+            legacy_hashes = set((source.metadata or {}).get('content_hashes', []))
+            if harvest_index or legacy_hashes:
+                # Previously harvested PDFs stay indexed; keep counting them
+                streamed_chunks = source.document_count
+                streamed_words = source.word_count
+
+            # Each PDF is chunked and indexed as soon as it downloads, so only
+            # one document's chunks are held in memory at a time
+            for pdf in collector.harvest_pdfs(pdf_urls, known_hashes=legacy_hashes, index=harvest_index):
+                try:
+                    pdf_documents, pdf_info = build_pdf_documents(
+                        pdf['path'], source, collection_method, vector_store, url=pdf['url']
+                    )
+                except Exception as e:
+                    print(f"Error extracting PDF {pdf['url']}: {e}")
+                    continue
+                finally:
+                    os.remove(pdf['path'])
+
+                if pdf_documents:
+                    vector_store.add_documents_batch(pdf_documents)
+                    streamed_chunks += len(pdf_documents)
+                    # The PDF's own word count; chunks overlap
+                    streamed_words += pdf_info['word_count']
+                harvest_index[pdf['url']] = pdf['entry']
+
+                job.processed_items += 1
+                job.progress = 10 + (job.processed_items / job.total_items) * 90 if job.total_items else 100
+                job_events.publish(job)
+
+            job.progress = 100  # Unchanged, duplicate and failed downloads never report progress
+            save_harvest_index(project.project_id, source.id, harvest_index)
 
-        # Store collection method in source metadata
-        if not source.metadata:
-            source.metadata = {}
-        source.metadata['collection_method'] = collection_method
-        
         # Add documents to vector store
         if documents:
             def vector_progress(current, total):
                 job.progress = 50 + (current / total) * 50  # Second half of progress
+                job_events.publish(job)
 
             vector_store.add_documents_batch(documents, progress_callback=vector_progress)
 
         # Calculate word count
-        total_words = sum(len(doc['text'].split()) for doc in documents)
+        total_words = streamed_words
+        if source.type != DataSourceType.PDF_URL:
+            total_words += sum(len(doc['text'].split()) for doc in documents)
+
+        project_stats.refresh_points(project.project_id)
+
+        # Update source with stats (on the current config, which a settings
+        # change may have replaced since the job started)
+        def record_sync(p: ProjectConfig):
+            current = next((s for s in p.data_sources if s.id == job.source_id), None)
+            if not current:
+                return
+            if not current.metadata:
+                current.metadata = {}
+            current.metadata['collection_method'] = collection_method
+            if source.type == DataSourceType.PDF_SITE:
+                current.metadata.pop('content_hashes', None)  # Now in the harvest index
+            current.last_synced = datetime.now()
+            current.word_count = total_words
+            current.document_count = streamed_chunks + len(documents)
 
-        # Update source with stats
-        source.last_synced = datetime.now()
-        source.word_count = total_words
-        source.document_count = len(documents)
-        save_project(project)
+        modify_project(project.project_id, record_sync)
 
         job.status = "completed"
         job.completed_at = datetime.now()
-        job.total_items = len(documents)
+        job.total_items = streamed_chunks + len(documents)
         
     except Exception as e:
         job.status = "failed"
         job.error = str(e)
         job.completed_at = datetime.now()
+    finally:
+        pinned.close()
+        job_events.publish(job)
 
 
 @app.post("/api/projects/{project_id}/sources/{source_id}/ingest")
@@ -493,6 +727,18 @@ async def ingest_source(project_id: str, source_id: str, background_tasks: Backg
     }
 
 
+@app.get("/api/jobs/stream")
+async def stream_jobs(project_id: Optional[str] = None):
+    """Server-sent event stream of ingestion job updates, optionally for one project"""
+    current = [j for j in ingestion_jobs.values() if not project_id or j.project_id == project_id]
+
+    return StreamingResponse(
+        job_events.stream(project_id, initial=current),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/api/jobs/{job_id}")
 async def get_job_status(job_id: str):
     """Get ingestion job status"""
@@ -503,73 +749,161 @@ async def get_job_status(job_id: str):
     return job.model_dump()
 
 
-@app.post("/api/chat")
-async def chat(request: ChatRequest):
-    """Chat with the AI agent"""
-    agent = get_or_create_agent(request.project_id)
-    
+async def run_chat(project_id: str, message: str, session_id: Optional[str] = None,
+                   seed: Optional[List[ChatMessage]] = None, traffic_class: str = "public") -> Dict:
+    """Answer a chat message within its session, subject to admission control"""
+    # A cold agent opens its vector store; keep that off the event loop
+    agent = await asyncio.to_thread(get_or_create_agent, project_id)
+
+    # History comes from the server-side session; client-sent history only
+    # seeds a new one. SQLite calls stay off the event loop.
+    session = await asyncio.to_thread(chat_sessions.get_or_create, session_id, project_id, seed)
+
+    history = session.history()
+
+    async def answer() -> Dict:
+        async with admission.admit(project_id, agent.config.ai_provider, traffic_class):
+            def pinned_chat() -> Dict:
+                # Keep the vector store from being evicted mid-search
+                with use_vector_store(project_id):
+                    return agent.chat(message=message, conversation_history=history)
+
+            return await asyncio.to_thread(pinned_chat)
+
     try:
-        response = agent.chat(
-            message=request.message,
-            conversation_history=request.conversation_history
-        )
-        
+        if history:
+            response = await answer()
+        else:
+            # Without history the answer depends only on the question and
+            # the prompt, so concurrent askers can share one generation
+            agent.get_system_prompt()
+            key = (project_id, agent.prompt_hash, normalize_message(message))
+            response = dict(await chat_flights.do(key, answer))
+
+        if not response.get('error'):
+            await asyncio.to_thread(
+                chat_sessions.extend, session, [("user", message), ("assistant", response['answer'])]
+            )
+        response['session_id'] = session.session_id
+
         return response
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail,
+                            headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def find_project_by_api_key(api_key: str) -> Optional[ProjectConfig]:
+    """The project with API access enabled for this key, if any"""
+    for project in load_all_projects():
+        if (project.api_enabled and project.project_api_key
+                and secrets.compare_digest(project.project_api_key, api_key)):
+            return project
+    return None
+
+
+@app.post("/api/chat")
+async def chat(request: ChatRequest, x_api_key: Optional[str] = Header(None)):
+    """
+    Chat with the AI agent. Requests carrying the project's API key
+    (X-API-Key) are admitted as API traffic rather than public chat.
+    """
+    traffic_class = "public"
+    if x_api_key:
+        project = load_project(request.project_id)
+        if not (project and project.api_enabled and project.project_api_key
+                and secrets.compare_digest(project.project_api_key, x_api_key)):
+            raise HTTPException(status_code=401, detail="Invalid API key")
+        traffic_class = "api"
+
+    return await run_chat(request.project_id, request.message, request.session_id,
+                          request.conversation_history, traffic_class)
+
+
+@app.post("/api/v1/chat")
+async def api_chat(request: ApiChatRequest, authorization: Optional[str] = Header(None)):
+    """Chat through a project API key (Authorization: Bearer <key>)"""
+    scheme, _, api_key = (authorization or "").partition(" ")
+    project = find_project_by_api_key(api_key.strip()) if scheme.lower() == "bearer" and api_key.strip() else None
+    if not project:
+        raise HTTPException(status_code=401, detail="Invalid API key")
+
+    return await run_chat(project.project_id, request.message, request.session_id, traffic_class="api")
+
+
+@app.get("/api/projects/{project_id}/chat/sessions/{session_id}")
+async def get_chat_session(project_id: str, session_id: str):
+    """Get a project's chat session messages"""
+    session = await asyncio.to_thread(chat_sessions.get, project_id, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    return {
+        "session_id": session.session_id,
+        "project_id": session.project_id,
+        "messages": [m.model_dump(mode='json') for m in session.history()]
+    }
+
+
+@app.delete("/api/projects/{project_id}/chat/sessions/{session_id}")
+async def delete_chat_session(project_id: str, session_id: str):
+    """End a project's chat session and forget its messages"""
+    if not await asyncio.to_thread(chat_sessions.delete, project_id, session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"message": "Session deleted"}
+
+
 @app.get("/api/projects/{project_id}/stats")
 async def get_stats(project_id: str):
     """Get project statistics"""
-    project = load_project(project_id)
+    project = await asyncio.to_thread(load_project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    # Get vector store stats without loading full agent (which loads SentenceTransformer)
-    vector_docs = 0
-    try:
-        from qdrant_client import QdrantClient
-        qdrant_path = f"./data/{project_id}/qdrant"
-        if os.path.exists(qdrant_path):
-            client = QdrantClient(path=qdrant_path)
-            try:
-                info = client.get_collection(project_id)
-                vector_docs = info.points_count
-            except:
-                pass
-    except Exception as e:
-        print(f"Error getting vector stats: {e}")
+    # Served from cached counters (no encoder); a cold counter opens a Qdrant client
+    stats = await asyncio.to_thread(project_stats.get, project)
 
     return {
         'project_name': project.project_name,
         'municipality': project.municipality_name,
         'ai_provider': project.ai_provider,
         'model': project.model_name,
-        'total_documents': vector_docs,
-        'data_sources': len(project.data_sources),
-        'active_sources': len([s for s in project.data_sources if s.enabled])
+        'total_documents': stats['vector_documents'],
+        'data_sources': stats['total_sources'],
+        'active_sources': stats['active_sources']
     }
 
 
 @app.get("/api/ollama/models")
 async def list_ollama_models():
-    """List available Ollama models"""
-    try:
-        import ollama
-        models = ollama.list()
-        return {
-            "models": [
-                {
-                    "name": m['name'],
-                    "size": m.get('size', 0),
-                    "modified_at": m.get('modified_at', '')
-                }
-                for m in models.get('models', [])
-            ]
-        }
-    except Exception as e:
-        return {"models": [], "error": str(e)}
+    """List available Ollama models (from the cached provider status)"""
+    if not provider_status.ollama_running:
+        return {"models": [], "error": provider_status.ollama_error}
+
+    return {
+        "models": [
+            {**m, "loaded": provider_status.is_loaded(m['name'])}
+            for m in provider_status.ollama_models
+        ],
+        "residency": residency.snapshot()
+    }
+
+
+@app.post("/api/projects/{project_id}/warm")
+async def warm_project_model(project_id: str):
+    """Load a project's Ollama model ahead of the first chat (e.g. on opening it)"""
+    project = load_project(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    if project.ai_provider != "ollama":
+        return {"model": project.model_name, "warming": False}
+
+    warming = (provider_status.ollama_running and provider_status.has_model(project.model_name)
+               and not provider_status.is_loaded(project.model_name))
+    residency.warm_project(project)
+    return {"model": project.model_name, "warming": warming}
 
 
 @app.get("/api/models/{provider}")
@@ -612,17 +946,18 @@ async def generate_personality(
 @app.post("/api/projects/{project_id}/generate-api-key")
 async def generate_api_key(project_id: str):
     """Generate a new API key for project access"""
-    import secrets
-
     project = load_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
     # Generate a secure API key
     api_key = f"nai_{secrets.token_urlsafe(32)}"
-    project.project_api_key = api_key
-    project.api_enabled = True
-    save_project(project)
+
+    def enable_api(p: ProjectConfig):
+        p.project_api_key = api_key
+        p.api_enabled = True
+
+    modify_project(project_id, enable_api)
 
     return {
         "api_key": api_key,
@@ -637,9 +972,11 @@ async def revoke_api_key(project_id: str):
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    project.project_api_key = None
-    project.api_enabled = False
-    save_project(project)
+    def disable_api(p: ProjectConfig):
+        p.project_api_key = None
+        p.api_enabled = False
+
+    modify_project(project_id, disable_api)
 
     return {"message": "API key revoked successfully"}
 
@@ -654,29 +991,26 @@ async def health_check():
         "checks": {}
     }
 
-    # Check Ollama
-    ollama_status = "not_running"
-    ollama_models = 0
-    try:
-        import ollama
-        models = ollama.list()
-        ollama_status = "running"
-        ollama_models = len(models.get('models', []))
+    # Check Ollama (last known state from the background probe)
+    ollama_status = "running" if provider_status.ollama_running else "not_running"
+    ollama_models = len(provider_status.ollama_models)
+    if provider_status.ollama_running:
         health["checks"]["ollama"] = {
             "status": "running",
-            "models_available": ollama_models
+            "models_available": ollama_models,
+            "models_loaded": sorted(provider_status.ollama_loaded)
         }
-    except Exception as e:
+    else:
         health["checks"]["ollama"] = {
             "status": "not_running",
-            "error": str(e)
+            "error": provider_status.ollama_error
         }
+    health["checks"]["ollama"]["checked_at"] = provider_status.checked_at
 
     # Check project count
     project_count = 0
     try:
-        if os.path.exists("./data"):
-            project_count = len([d for d in os.listdir("./data") if os.path.isdir(f"./data/{d}") and not d.startswith('.')])
+        project_count = project_repo.count()
         health["checks"]["projects"] = {
             "status": "ok",
             "count": project_count
@@ -703,10 +1037,16 @@ async def health_check():
 @app.get("/api/projects/{project_id}/health")
 async def project_health(project_id: str):
     """Get health status for a specific project"""
-    project = load_project(project_id)
+    project = await asyncio.to_thread(load_project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
+    return await asyncio.to_thread(build_project_health, project)
+
+
+def build_project_health(project: ProjectConfig) -> Dict:
+    """Health report for a project from cached provider status and counters"""
+    project_id = project.project_id
     issues = []
     ready = True
 
@@ -714,52 +1054,37 @@ async def project_health(project_id: str):
     ai_provider_status = "ready"
     ai_provider_message = None
     if project.ai_provider == "ollama":
-        try:
-            import ollama
-            models = ollama.list()
-            model_names = [m['name'] for m in models.get('models', [])]
-            model_available = any(project.model_name in name for name in model_names)
-            if not model_available:
+        if provider_status.ollama_running:
+            if not provider_status.has_model(project.model_name):
                 ai_provider_status = "model_missing"
                 ai_provider_message = f"Model '{project.model_name}' not found. Run: ollama pull {project.model_name}"
                 issues.append(f"Model not installed: {project.model_name}")
                 ready = False
-        except Exception as e:
+        else:
             ai_provider_status = "not_running"
             ai_provider_message = "Ollama not running. Run: ollama serve"
             issues.append("Ollama is not running")
             ready = False
     else:
-        has_key = bool(project.api_key) or bool(os.getenv(f"{project.ai_provider.upper()}_API_KEY"))
-        if not has_key:
+        if not provider_status.has_api_key(project.ai_provider, project.api_key):
             ai_provider_status = "missing_api_key"
             ai_provider_message = f"API key not configured for {project.ai_provider}"
             issues.append(f"Missing API key for {project.ai_provider}")
             ready = False
 
-    # Check vector store
-    vector_docs = 0
+    # Check vector store and data sources (cached counters)
+    stats = project_stats.get(project)
+    vector_docs = stats['vector_documents']
     vector_status = "ready"
-    try:
-        from vector_store import VectorStore
-        vs = VectorStore(
-            path=f"./data/{project_id}/qdrant",
-            collection_name=project_id
-        )
-        stats = vs.get_stats()
-        vector_docs = stats.get('total_documents', 0)
-        if vector_docs == 0:
-            vector_status = "empty"
-    except Exception as e:
+    if stats['vector_error']:
         vector_status = "error"
+    elif vector_docs == 0:
+        vector_status = "empty"
 
-    # Check data sources
-    total_sources = len(project.data_sources)
-    synced_sources = len([s for s in project.data_sources if s.last_synced])
-
-    # Calculate total words and docs from sources
-    total_words = sum(s.word_count for s in project.data_sources if s.word_count)
-    total_docs_from_sources = sum(s.document_count for s in project.data_sources if s.document_count)
+    total_sources = stats['total_sources']
+    synced_sources = stats['synced_sources']
+    total_words = stats['total_words']
+    total_docs_from_sources = stats['total_chunks']
 
     if synced_sources == 0 and total_sources > 0:
         issues.append("No data sources have been ingested")
@@ -778,6 +1103,7 @@ async def project_health(project_id: str):
             "status": ai_provider_status,
             "provider": project.ai_provider,
             "model": project.model_name,
+            "loaded": project.ai_provider == "ollama" and provider_status.is_loaded(project.model_name),
             "message": ai_provider_message
         },
         "vector_store": {
@@ -794,79 +1120,233 @@ async def project_health(project_id: str):
     }
 
 
+DOCUMENT_FIELDS = [
+    "text", "full_text", "source", "source_type", "url", "title", "date", "page_start", "page_end",
+    "word_count", "metadata"
+]
+DEFAULT_DOCUMENT_FIELDS = [
+    "text", "source", "source_type", "url", "title", "date", "page_start", "page_end", "word_count", "metadata"
+]
+DOCUMENT_PREVIEW_CHARS = 500
+MAX_DOCUMENT_PAGE = 500
+
+
+def encode_cursor(offset) -> Optional[str]:
+    """Wrap a Qdrant scroll offset (a point ID) in an opaque cursor"""
+    if offset is None:
+        return None
+    return base64.urlsafe_b64encode(json.dumps({"o": offset}).encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    """Unwrap a cursor produced by encode_cursor"""
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))["o"]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_document_fields(fields: Optional[str], default: List[str]) -> List[str]:
+    """Parse a comma-separated field projection"""
+    if not fields:
+        return default
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in DOCUMENT_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+
+def build_document_filter(project: ProjectConfig, source_id: Optional[str], source_type: Optional[str],
+                          date_from: Optional[str], date_to: Optional[str]):
+    """Qdrant payload filter for the document browser"""
+    from qdrant_client.models import Filter, FieldCondition, MatchValue, DatetimeRange
+
+    conditions = []
+    if source_id:
+        # Find source name by ID
+        source = next((s for s in project.data_sources if s.id == source_id), None)
+        if not source:
+            raise HTTPException(status_code=404, detail="Source not found")
+        conditions.append(FieldCondition(key="source", match=MatchValue(value=source.name)))
+    if source_type:
+        conditions.append(FieldCondition(key="source_type", match=MatchValue(value=source_type)))
+    if date_from or date_to:
+        try:
+            date_range = DatetimeRange(gte=date_from, lte=date_to)
+        except (ValidationError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid date_from or date_to (use ISO 8601, e.g. 2024-01-31)")
+        conditions.append(FieldCondition(key="date", range=date_range))
+
+    return Filter(must=conditions) if conditions else None
+
+
+def document_payload_keys(fields: List[str]):
+    """Payload keys to fetch for a projection (True means the whole payload)"""
+    if "metadata" in fields:
+        return True
+
+    keys = {"text" if f == "full_text" else f for f in fields}
+    return sorted(keys)
+
+
+def format_document(record, fields: List[str]) -> Dict:
+    """Shape a Qdrant record into the requested document fields"""
+    payload = record.payload or {}
+    text = payload.get("text", "")
+    document = {"id": str(record.id)}
+
+    for field in fields:
+        if field == "text":
+            document["text"] = text[:DOCUMENT_PREVIEW_CHARS] + ("..." if len(text) > DOCUMENT_PREVIEW_CHARS else "")
+        elif field == "full_text":
+            document["full_text"] = text
+        elif field == "metadata":
+            document["metadata"] = {k: v for k, v in payload.items() if k not in DOCUMENT_FIELDS}
+        elif field == "word_count":
+            document["word_count"] = payload.get("word_count", 0)
+        elif field in ("page_start", "page_end"):
+            document[field] = payload.get(field)  # PDF chunks only
+        else:
+            document[field] = payload.get(field, "unknown" if field in ("source", "source_type") else "")
+
+    return document
+
+
+def get_document_client(project_id: str):
+    """Shared Qdrant client for a project's documents, or None if nothing is indexed yet"""
+    qdrant_path = f"./data/{project_id}/qdrant"
+    if not os.path.exists(qdrant_path):
+        return None
+
+    client = get_qdrant_client(qdrant_path)
+    if not client.collection_exists(project_id):
+        return None
+    ensure_payload_indexes(client, project_id)
+    return client
+
+
 @app.get("/api/projects/{project_id}/documents")
 async def get_project_documents(
     project_id: str,
     limit: int = 50,
-    offset: int = 0,
-    source_id: Optional[str] = None
+    cursor: Optional[str] = None,
+    source_id: Optional[str] = None,
+    source_type: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    fields: Optional[str] = None
 ):
-    """Get documents from the vector store for a project"""
+    """
+    Browse documents in the vector store.
+
+    Pages are keyset-paginated with an opaque `cursor` (pass back
+    `next_cursor`). `fields` is a comma-separated projection; the default
+    returns a text preview and metadata, add `full_text` for whole chunks.
+    """
     project = load_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    try:
-        from qdrant_client import QdrantClient
-        from qdrant_client.models import Filter, FieldCondition, MatchValue
-
-        client = QdrantClient(path=f"./data/{project_id}/qdrant")
-
-        # Build filter if source_id provided
-        query_filter = None
-        if source_id:
-            # Find source name by ID
-            source = next((s for s in project.data_sources if s.id == source_id), None)
-            if source:
-                query_filter = Filter(
-                    must=[FieldCondition(key="source", match=MatchValue(value=source.name))]
-                )
+    limit = max(1, min(limit, MAX_DOCUMENT_PAGE))
+    selected_fields = parse_document_fields(fields, DEFAULT_DOCUMENT_FIELDS)
+    query_filter = build_document_filter(project, source_id, source_type, date_from, date_to)
+    offset = decode_cursor(cursor) if cursor else None
 
-        # Get collection info
-        try:
-            collection_info = client.get_collection(project_id)
-            total_count = collection_info.points_count
-        except:
-            return {"documents": [], "total": 0, "limit": limit, "offset": offset}
+    try:
+        client = get_document_client(project_id)
+        if client is None:
+            return {"documents": [], "total": 0, "limit": limit, "next_cursor": None}
 
-        # Scroll through documents
         records, next_offset = client.scroll(
             collection_name=project_id,
             limit=limit,
             offset=offset,
             scroll_filter=query_filter,
-            with_payload=True,
+            with_payload=document_payload_keys(selected_fields),
             with_vectors=False
         )
 
-        documents = []
-        for record in records:
-            payload = record.payload or {}
-            documents.append({
-                "id": str(record.id),
-                "text": payload.get("text", "")[:500] + ("..." if len(payload.get("text", "")) > 500 else ""),
-                "full_text": payload.get("text", ""),
-                "source": payload.get("source", "unknown"),
-                "source_type": payload.get("source_type", "unknown"),
-                "url": payload.get("url", ""),
-                "title": payload.get("title", ""),
-                "date": payload.get("date", ""),
-                "word_count": payload.get("word_count", 0),
-                "metadata": {k: v for k, v in payload.items() if k not in ["text", "source", "source_type", "url", "title", "date", "word_count"]}
-            })
+        # Count matches on the first page only; later pages reuse it
+        total = None
+        if cursor is None:
+            total = client.count(collection_name=project_id, count_filter=query_filter, exact=True).count
 
         return {
-            "documents": documents,
-            "total": total_count,
+            "documents": [format_document(record, selected_fields) for record in records],
+            "total": total,
             "limit": limit,
-            "offset": offset,
-            "next_offset": next_offset
+            "next_cursor": encode_cursor(next_offset)
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/projects/{project_id}/documents/export")
+async def export_project_documents(
+    project_id: str,
+    source_id: Optional[str] = None,
+    source_type: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """Stream matching documents as NDJSON (full text by default)"""
+    project = load_project(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    selected_fields = parse_document_fields(
+        fields, ["full_text", "source", "source_type", "url", "title", "date", "page_start", "page_end",
+                 "word_count", "metadata"]
+    )
+    query_filter = build_document_filter(project, source_id, source_type, date_from, date_to)
+    client = get_document_client(project_id)
+
+    def export_lines():
+        if client is None:
+            return
+        offset = None
+        while True:
+            records, offset = client.scroll(
+                collection_name=project_id,
+                limit=256,
+                offset=offset,
+                scroll_filter=query_filter,
+                with_payload=document_payload_keys(selected_fields),
+                with_vectors=False
+            )
+            for record in records:
+                yield json.dumps(format_document(record, selected_fields), default=str) + "\n"
+            if offset is None:
+                break
+
+    return StreamingResponse(
+        export_lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{project_id}-documents.ndjson"'}
+    )
+
+
+@app.get("/api/projects/{project_id}/documents/{document_id}")
+async def get_project_document(project_id: str, document_id: str):
+    """Get one document with its full text"""
+    project = load_project(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    client = get_document_client(project_id)
+    records = client.retrieve(project_id, ids=[document_id], with_payload=True) if client else []
+    if not records:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    return format_document(records[0], DOCUMENT_FIELDS)
+
+
 @app.get("/api/projects/{project_id}/config")
 async def get_project_config(project_id: str):
     """Get raw project configuration file"""
@@ -875,6 +1355,7 @@ async def get_project_config(project_id: str):
         raise HTTPException(status_code=404, detail="Project not found")
 
     config_path = f"./data/{project_id}/config.json"
+    project_repo.flush(project_id)
     if os.path.exists(config_path):
         with open(config_path, 'r') as f:
             return {"config": f.read(), "path": config_path}
@@ -898,13 +1379,11 @@ async def save_project_config(project_id: str, config_content: Dict):
 
         # Validate and update project
         updated_project = ProjectConfig(**config_dict)
+        changed = changed_config_fields(project.model_dump(), updated_project)
         save_project(updated_project)
 
-        # Invalidate caches
-        if project_id in agents:
-            del agents[project_id]
-        if project_id in vector_stores:
-            del vector_stores[project_id]
+        # Rebuild only what the changed fields affect
+        refresh_project_caches(project_id, updated_project, changed)
 
         return {"message": "Configuration saved successfully"}
     except json.JSONDecodeError as e:
@@ -934,10 +1413,26 @@ async def upload_pdf(
         upload_dir = f"./data/{project_id}/uploads"
         os.makedirs(upload_dir, exist_ok=True)
 
+        # Stream the upload to disk in chunks. UploadSizeLimit already turned
+        # away oversized bodies; this catches a file over the cap in a body
+        # within the multipart allowance.
         file_path = f"{upload_dir}/{file.filename}"
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        partial_path = f"{file_path}.part"
+        file_size = 0
+        try:
+            with open(partial_path, "wb") as f:
+                while chunk := await file.read(DOWNLOAD_CHUNK_SIZE):
+                    file_size += len(chunk)
+                    if file_size > MAX_PDF_BYTES:
+                        raise HTTPException(
+                            status_code=413,
+                            detail=f"PDF exceeds {MAX_PDF_BYTES // (1024 * 1024)}MB limit"
+                        )
+                    f.write(chunk)
+            os.replace(partial_path, file_path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
 
         # Create a source for this PDF
         source = DataSource(
@@ -951,12 +1446,11 @@ async def upload_pdf(
                 "file_path": file_path,
                 "original_filename": file.filename,
                 "collection_method": "pdf_upload",
-                "file_size": len(content)
+                "file_size": file_size
             }
         )
 
-        project.data_sources.append(source)
-        save_project(project)
+        modify_project(project_id, lambda p: p.data_sources.append(source))
 
         # Create ingestion job
         job = DataIngestionJob(
@@ -975,34 +1469,24 @@ async def upload_pdf(
             "job_id": job.job_id
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def ingest_pdf_upload(job: DataIngestionJob, project: ProjectConfig, file_path: str):
+def ingest_pdf_upload(job: DataIngestionJob, project: ProjectConfig, file_path: str):
     """Background task to ingest uploaded PDF"""
     ingestion_jobs[job.job_id] = job
     job.status = "running"
     job.started_at = datetime.now()
+    job_events.publish(job)
+    pinned = ExitStack()
 
     try:
-        from collectors.pdf_collector import PDFCollector
-
-        collector = PDFCollector()
-        pdf_data = collector.extract_from_file(file_path)
-
-        if not pdf_data:
-            job.status = "failed"
-            job.error = "Failed to extract text from PDF"
-            return
-
-        # Get or create vector store (cached to avoid locking issues)
-        if project.project_id not in vector_stores:
-            vector_stores[project.project_id] = VectorStore(
-                path=f"./data/{project.project_id}/qdrant",
-                collection_name=project.project_id
-            )
-        vector_store = vector_stores[project.project_id]
+        # Get or create vector store (cached to avoid locking issues),
+        # pinned for the whole job
+        vector_store = pinned.enter_context(use_vector_store(project.project_id))
 
         # Find the source
         source = next((s for s in project.data_sources if s.id == job.source_id), None)
@@ -1011,39 +1495,42 @@ async def ingest_pdf_upload(job: DataIngestionJob, project: ProjectConfig, file_
             job.error = "Source not found"
             return
 
-        # Chunk the PDF text
-        chunks = vector_store.chunk_text(pdf_data['full_text'])
-        job.total_items = len(chunks)
+        def progress(current, total):
+            job.processed_items = current
+            job.total_items = total
+            job.progress = (current / total) * 50 if total > 0 else 0
+            job_events.publish(job)
 
-        documents = []
-        for i, chunk in enumerate(chunks):
-            documents.append({
-                'text': chunk,
-                'metadata': {
-                    'source': source.name,
-                    'source_type': 'pdf',
-                    'collection_method': 'pdf_upload',
-                    'url': source.url,
-                    'title': pdf_data.get('title', source.name),
-                    'date': '',
-                    'page_count': pdf_data.get('num_pages', 0)
-                }
-            })
-            job.processed_items = i + 1
-            job.progress = ((i + 1) / len(chunks)) * 50
+        # Chunk the PDF page by page
+        documents, pdf_info = build_pdf_documents(
+            file_path, source, 'pdf_upload', vector_store, progress_callback=progress
+        )
+
+        if not documents:
+            job.status = "failed"
+            job.error = "Failed to extract text from PDF"
+            job.completed_at = datetime.now()
+            return
 
         # Add to vector store
         if documents:
             def vector_progress(current, total):
                 job.progress = 50 + (current / total) * 50
+                job_events.publish(job)
 
             vector_store.add_documents_batch(documents, progress_callback=vector_progress)
 
+        project_stats.refresh_points(project.project_id)
+
         # Update source stats
-        source.last_synced = datetime.now()
-        source.word_count = pdf_data.get('word_count', 0)
-        source.document_count = len(documents)
-        save_project(project)
+        def record_sync(p: ProjectConfig):
+            current = next((s for s in p.data_sources if s.id == job.source_id), None)
+            if current:
+                current.last_synced = datetime.now()
+                current.word_count = pdf_info['word_count']
+                current.document_count = len(documents)
+
+        modify_project(project.project_id, record_sync)
 
         job.status = "completed"
         job.completed_at = datetime.now()
@@ -1053,11 +1540,26 @@ async def ingest_pdf_upload(job: DataIngestionJob, project: ProjectConfig, file_
         job.status = "failed"
         job.error = str(e)
         job.completed_at = datetime.now()
+    finally:
+        pinned.close()
+        job_events.publish(job)
+
+
+@app.get("/api/admin/resources")
+async def resource_stats():
+    """Cached agents, vector stores, Qdrant and LLM clients, process memory, chat traffic and model health"""
+    return {
+        **resources.stats(),
+        "llm_clients": llm_clients.client_stats(),
+        "chat_flights": chat_flights.stats(),
+        "chat_admission": admission.stats(),
+        "model_health": provider_health.stats()
+    }
 
 
 @app.get("/api/admin/jobs")
-async def list_jobs():
-    """List all ingestion jobs"""
+async def list_jobs(project_id: Optional[str] = None):
+    """List all ingestion jobs, optionally for one project"""
     return {
         "jobs": [
             {
@@ -1071,6 +1573,7 @@ async def list_jobs():
                 "error": job.error
             }
             for job in ingestion_jobs.values()
+            if not project_id or job.project_id == project_id
         ]
     }
 
@@ -0,0 +1,125 @@
+"""
+Chat History
+Token-budgeted conversation history with a rolling extractive summary
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+CHARS_PER_TOKEN = 4  # Rough average for English text with common tokenizers
+SUMMARY_CACHE_SIZE = 512  # Cached summaries (one per folded conversation prefix)
+SUMMARY_LINE_CHARS = 240  # Max characters kept from each folded turn
+MAX_SUMMARY_LINES = 100  # Folded turns remembered per conversation
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count without a model-specific tokenizer"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def first_sentence(text: str, max_chars: int = SUMMARY_LINE_CHARS) -> str:
+    """Leading sentence of a message, collapsed to one line"""
+    text = " ".join(text.split())
+    match = re.match(r"(.+?[.!?])(\s|$)", text)
+    sentence = match.group(1) if match else text
+    if len(sentence) > max_chars:
+        sentence = sentence[:max_chars].rsplit(" ", 1)[0] + "..."
+    return sentence
+
+
+class HistoryManager:
+    """
+    Fits conversation history into a token budget.
+
+    The most recent turns are kept verbatim while they fit; older turns are
+    folded into a short extractive summary (the first sentence of each turn).
+    Summaries are cached by a hash chain over the folded turns, so each turn
+    of a growing conversation only summarizes the turns newly folded.
+    """
+
+    def __init__(self, cache_size: int = SUMMARY_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._summaries: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def compact(self, history: Sequence, token_budget: int) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Split history (ChatMessages or role/content dicts) into recent
+        messages to send verbatim and a summary of the rest (or None).
+        """
+        turns = [self._as_dict(msg) for msg in history]
+
+        # Keep recent turns verbatim while they fit
+        used = 0
+        start = len(turns)
+        while start > 0:
+            cost = estimate_tokens(turns[start - 1]['content'])
+            if used + cost > token_budget:
+                break
+            used += cost
+            start -= 1
+
+        # Start the verbatim window on a user turn (some providers require it)
+        while start < len(turns) and turns[start]['role'] != "user":
+            start += 1
+
+        if start == 0:
+            return turns, None
+
+        # Older turns get at most a quarter of the budget as summary lines
+        lines = self._summary_lines(turns[:start])
+        summary_budget = max(token_budget // 4, 1)
+        kept: List[str] = []
+        for line in reversed(lines):
+            summary_budget -= estimate_tokens(line)
+            if summary_budget < 0:
+                break
+            kept.append(line)
+
+        if not kept:
+            return turns[start:], None
+        kept.reverse()
+        if len(kept) < len(lines) or len(lines) < start:
+            kept.insert(0, "(earlier turns omitted)")
+        return turns[start:], "\n".join(kept)
+
+    def _summary_lines(self, turns: List[Dict]) -> List[str]:
+        """Summary lines for a conversation prefix, reusing cached work"""
+        keys = []
+        digest = ""
+        for turn in turns:
+            digest = hashlib.sha1(f"{digest}\0{turn['role']}\0{turn['content']}".encode()).hexdigest()
+            keys.append(digest)
+
+        with self._lock:
+            # Longest prefix already summarized
+            lines: List[str] = []
+            done = 0
+            for i in range(len(keys) - 1, -1, -1):
+                if keys[i] in self._summaries:
+                    lines = list(self._summaries[keys[i]])
+                    self._summaries.move_to_end(keys[i])
+                    done = i + 1
+                    break
+
+        for turn in turns[done:]:
+            speaker = "User" if turn['role'] == "user" else "Assistant"
+            lines.append(f"- {speaker}: {first_sentence(turn['content'])}")
+
+        lines = lines[-MAX_SUMMARY_LINES:]
+        with self._lock:
+            self._summaries[keys[-1]] = lines
+            self._summaries.move_to_end(keys[-1])
+            while len(self._summaries) > self.cache_size:
+                self._summaries.popitem(last=False)
+
+        return lines
+
+    def _as_dict(self, msg) -> Dict:
+        if isinstance(msg, dict):
+            return {"role": msg["role"], "content": msg["content"]}
+        return {"role": msg.role, "content": msg.content}
@@ -0,0 +1,153 @@
+"""
+Chat Sessions
+Server-side conversation history keyed by project and session ID
+"""
+
+import secrets
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from models import ChatMessage
+from resource_manager import ResourceCache
+
+
+MAX_SESSIONS = 1000  # Sessions held in memory
+SESSION_IDLE_TTL = 3600  # Seconds before an idle session leaves memory
+MAX_SESSION_MESSAGES = 50  # Messages kept per session (history is compacted anyway)
+
+
+class ChatSession:
+    """One conversation's messages (role/content/timestamp only)"""
+
+    def __init__(self, session_id: str, project_id: str, messages: Optional[List[ChatMessage]] = None):
+        self.session_id = session_id
+        self.project_id = project_id
+        self.messages: List[ChatMessage] = messages or []
+        self.lock = threading.Lock()
+
+    def history(self) -> List[ChatMessage]:
+        """Snapshot of the messages so far"""
+        with self.lock:
+            return list(self.messages)
+
+
+class SessionStore:
+    """
+    Chat sessions bounded in memory (LRU plus idle eviction), keyed by
+    (project_id, session_id) so a session is only visible to its project.
+    Session IDs are issued by the server.
+
+    With db_path set, messages are also written to SQLite as they are
+    appended, so sessions survive eviction and restarts. The SQLite calls
+    block; call them off the event loop.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_sessions: int = MAX_SESSIONS,
+                 idle_ttl: int = SESSION_IDLE_TTL, max_messages: int = MAX_SESSION_MESSAGES):
+        self.sessions = ResourceCache("chat_sessions", max_sessions, idle_ttl)
+        self.max_messages = max_messages
+        self.db_path = db_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS chat_messages (
+                    session_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    project_id TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    PRIMARY KEY (session_id, seq)
+                )
+            """)
+            self._db.commit()
+
+    def get(self, project_id: str, session_id: str) -> Optional[ChatSession]:
+        """Get a project's session from memory or the database"""
+        key = (project_id, session_id)
+        session = self.sessions.get(key)
+        if session is None and self._db is not None:
+            session = self._load(project_id, session_id)
+            if session is not None:
+                self.sessions[key] = session
+        return session
+
+    def get_or_create(self, session_id: Optional[str], project_id: str,
+                      seed: Optional[List[ChatMessage]] = None) -> ChatSession:
+        """
+        Get a project's session, or start one under a new server-issued ID
+        seeded with client-sent history. Unknown IDs, including another
+        project's, start a new session rather than adopting the ID.
+        """
+        session = self.get(project_id, session_id) if session_id else None
+        if session is not None:
+            return session
+
+        session = ChatSession(secrets.token_urlsafe(24), project_id)
+        self.extend(session, [(msg.role, msg.content) for msg in (seed or [])[-self.max_messages:]])
+        self.sessions[(project_id, session.session_id)] = session
+        return session
+
+    def append(self, session: ChatSession, role: str, content: str):
+        """Add a message to a session"""
+        self.extend(session, [(role, content)])
+
+    def extend(self, session: ChatSession, messages: Sequence[Tuple[str, str]]):
+        """Add (role, content) messages to a session, with one database commit"""
+        if not messages:
+            return
+        new = [ChatMessage(role=role, content=content) for role, content in messages]
+        with session.lock:
+            session.messages.extend(new)
+            del session.messages[:-self.max_messages]
+
+            if self._db is not None:
+                with self._db_lock:
+                    for message in new:
+                        self._db.execute(
+                            "INSERT INTO chat_messages (session_id, seq, project_id, role, content, timestamp) "
+                            "VALUES (?, COALESCE((SELECT MAX(seq) + 1 FROM chat_messages WHERE session_id = ?), 0), ?, ?, ?, ?)",
+                            (session.session_id, session.session_id, session.project_id,
+                             message.role, message.content, message.timestamp.isoformat())
+                        )
+                    self._db.commit()
+
+    def delete(self, project_id: str, session_id: str) -> bool:
+        """Forget a project's session; False if it has no such session"""
+        found = self.sessions.pop((project_id, session_id)) is not None
+        if self._db is not None:
+            with self._db_lock:
+                cursor = self._db.execute(
+                    "DELETE FROM chat_messages WHERE project_id = ? AND session_id = ?", (project_id, session_id)
+                )
+                self._db.commit()
+            found = found or cursor.rowcount > 0
+        return found
+
+    def close(self):
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+                self._db = None
+
+    def _load(self, project_id: str, session_id: str) -> Optional[ChatSession]:
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT role, content, timestamp FROM chat_messages "
+                "WHERE project_id = ? AND session_id = ? ORDER BY seq DESC LIMIT ?",
+                (project_id, session_id, self.max_messages)
+            ).fetchall()
+        if not rows:
+            return None
+
+        messages = [
+            ChatMessage(role=role, content=content, timestamp=datetime.fromisoformat(timestamp))
+            for role, content, timestamp in reversed(rows)
+        ]
+        return ChatSession(session_id, project_id, messages)
@@ -5,72 +5,483 @@ Extracts text and metadata from PDF documents
 
 import requests
 from pypdf import PdfReader
-from typing import Dict, Optional, List
-import io
+from typing import Dict, Optional, List, Iterator, Set
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urljoin, urldefrag, urlparse
+import contextlib
+import hashlib
+import multiprocessing
+import os
 import re
+import shutil
+import signal
+import tempfile
+import threading
+import time
+from collections import deque
+
+# OCR is optional (requires pytesseract, Pillow and the tesseract binary)
+try:
+    import pytesseract
+    OCR_AVAILABLE = shutil.which(pytesseract.pytesseract.tesseract_cmd) is not None
+except ImportError:
+    OCR_AVAILABLE = False
+
+
+# Parallel extraction settings
+PARALLEL_MIN_PAGES = 40  # Smaller PDFs are extracted serially
+POOL_WORKERS = min(4, os.cpu_count() or 1)  # Processes in the shared extraction/OCR pool
+PAGES_PER_TASK = 25  # Page range handed to each worker
+PAGE_TIMEOUT = 30  # Seconds before a pathological page is skipped
+
+# OCR settings
+OCR_MIN_WORDS = 5  # Pages with fewer extracted words are treated as scanned
+OCR_CACHE_DIR = "./data/.ocr_cache"  # Dot-prefixed so it is never listed as a project
+OCR_TIMEOUT = 120  # Seconds to wait for a single page's OCR
+
+# Download settings
+MAX_PDF_BYTES = 200 * 1024 * 1024  # 200MB max per PDF
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # Stream to disk 1MB at a time
+
+
+class PageTimeout(Exception):
+    """Raised when a single page takes too long to extract"""
+
+
+class PDFTooLarge(Exception):
+    """Raised when a PDF exceeds MAX_PDF_BYTES"""
+
+
+_worker_pool: Optional[ProcessPoolExecutor] = None
+_worker_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> ProcessPoolExecutor:
+    """
+    The module's long-lived process pool for page ranges and OCR, started
+    on first use. Spawn rather than fork (the API process may hold
+    torch/Qdrant threads); each spawned worker re-imports the entry
+    script once, so the pool is reused rather than started per PDF.
+    """
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None or getattr(_worker_pool, '_broken', False):
+            context = multiprocessing.get_context('spawn')
+            _worker_pool = ProcessPoolExecutor(max_workers=POOL_WORKERS, mp_context=context)
+        return _worker_pool
+
+
+def shutdown_worker_pool():
+    """Stop the shared pool (e.g. at app shutdown); it restarts on next use"""
+    global _worker_pool
+    with _worker_pool_lock:
+        pool, _worker_pool = _worker_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+@contextlib.contextmanager
+def page_time_limit(seconds: int):
+    """Abort the enclosed block after `seconds` (Unix main thread only)"""
+    if not seconds or not hasattr(signal, 'SIGALRM') or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def handler(signum, frame):
+        raise PageTimeout()
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def clean_page_text(text: str) -> str:
+    """Collapse whitespace in extracted page text"""
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+def extract_text_by_deadline(page, seconds: int) -> str:
+    """
+    Extract a page's text on a helper thread, raising PageTimeout after
+    `seconds`. For threads that can't use SIGALRM; a page that times out
+    is abandoned, not stopped.
+    """
+    result = {}
+
+    def run():
+        try:
+            result['text'] = page.extract_text()
+        except Exception as e:
+            result['error'] = e
+
+    worker = threading.Thread(target=run, name="pdf-page", daemon=True)
+    worker.start()
+    worker.join(seconds)
+    if worker.is_alive():
+        raise PageTimeout()
+    if 'error' in result:
+        raise result['error']
+    return result['text']
+
+
+def extract_page(reader: PdfReader, index: int, page_timeout: int = PAGE_TIMEOUT) -> Dict:
+    """Extract a single page, skipping it if it times out or fails"""
+    skipped = False
+    try:
+        if page_timeout and threading.current_thread() is not threading.main_thread():
+            text = clean_page_text(extract_text_by_deadline(reader.pages[index], page_timeout))
+        else:
+            with page_time_limit(page_timeout):
+                text = clean_page_text(reader.pages[index].extract_text())
+    except PageTimeout:
+        print(f"Skipping page {index + 1}: extraction exceeded {page_timeout}s")
+        text = ''
+        skipped = True
+    except Exception as e:
+        print(f"Skipping page {index + 1}: {e}")
+        text = ''
+        skipped = True
+
+    return {
+        'page_number': index + 1,
+        'text': text,
+        'word_count': len(text.split()),
+        'skipped': skipped
+    }
+
+
+_worker_reader: Optional[tuple] = None  # ((path, mtime, size), PdfReader) last opened in this worker
+
+
+def open_worker_reader(file_path: str) -> PdfReader:
+    """Open a PDF in a pool worker, reusing the reader while tasks stay on the same file"""
+    global _worker_reader
+    stat = os.stat(file_path)
+    key = (file_path, stat.st_mtime_ns, stat.st_size)
+    if _worker_reader is None or _worker_reader[0] != key:
+        _worker_reader = (key, PdfReader(file_path))
+    return _worker_reader[1]
+
+
+def ocr_page(file_path: str, index: int, cache_dir: str = OCR_CACHE_DIR) -> str:
+    """
+    Worker entry point: OCR the images on one PDF page.
+
+    Results are cached on disk keyed by the SHA-256 of the page's image
+    bytes, so the same scan is never OCR'd twice across files or syncs.
+    """
+    page = open_worker_reader(file_path).pages[index]
+    images = page.images
+    if not images:
+        return ''
+
+    digest = hashlib.sha256()
+    for image in images:
+        digest.update(image.data)
+    cache_path = os.path.join(cache_dir, f"{digest.hexdigest()}.txt")
+
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    text = clean_page_text(' '.join(pytesseract.image_to_string(image.image) for image in images))
+
+    # Write atomically so concurrent workers never read a partial entry
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, cache_path)
+
+    return text
+
+
+def extract_page_range(file_path: str, start: int, end: int, page_timeout: int = PAGE_TIMEOUT) -> List[Dict]:
+    """Worker entry point: extract pages [start, end) from a PDF on disk"""
+    reader = open_worker_reader(file_path)
+    return [extract_page(reader, i, page_timeout) for i in range(start, end)]
 
 
 class PDFCollector:
     """Extracts content from PDF files"""
     
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None, page_timeout: int = PAGE_TIMEOUT,
+                 enable_ocr: bool = True, ocr_cache_dir: str = OCR_CACHE_DIR):
         self.session = requests.Session()
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.page_timeout = page_timeout
+        self.enable_ocr = enable_ocr and OCR_AVAILABLE
+        self.ocr_cache_dir = ocr_cache_dir
     
+    def download_to_file(self, pdf_url: str, dest_dir: Optional[str] = None,
+                         max_bytes: int = MAX_PDF_BYTES) -> str:
+        """
+        Stream a PDF to a temp file and return its path.
+
+        The body is written in chunks so memory use does not grow with the
+        PDF size. Raises PDFTooLarge as soon as the declared or received
+        size passes `max_bytes`; the partial file is removed.
+        """
+        path, _ = self.download_with_hash(pdf_url, dest_dir=dest_dir, max_bytes=max_bytes)
+        return path
+
+    def download_with_hash(self, pdf_url: str, dest_dir: Optional[str] = None,
+                           max_bytes: int = MAX_PDF_BYTES) -> tuple[str, str]:
+        """Stream a PDF to a temp file, returning (path, sha256 of the content)"""
+        with self.session.get(pdf_url, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            return self._stream_to_file(response, dest_dir, max_bytes)
+
+    def download_if_changed(self, pdf_url: str, known: Optional[Dict] = None, dest_dir: Optional[str] = None,
+                            max_bytes: int = MAX_PDF_BYTES) -> Optional[Dict]:
+        """
+        Download a PDF unless it is unchanged since `known` (an entry from an
+        earlier download): a 304 or the same ETag/Last-Modified, or, when
+        the server sends neither, the same Content-Length. Returns None if
+        unchanged, else the temp file's 'path' plus the entry fields
+        ('sha256', 'etag', 'last_modified', 'content_length').
+        """
+        known = known or {}
+        headers = {}
+        if known.get('etag'):
+            headers['If-None-Match'] = known['etag']
+        if known.get('last_modified'):
+            headers['If-Modified-Since'] = known['last_modified']
+
+        with self.session.get(pdf_url, timeout=30, stream=True, headers=headers) as response:
+            if response.status_code == 304:
+                return None
+            response.raise_for_status()
+
+            etag = response.headers.get('etag')
+            last_modified = response.headers.get('last-modified')
+            content_length = response.headers.get('content-length')
+            if known:
+                if etag or last_modified:
+                    unchanged = (etag or None, last_modified or None) == (known.get('etag'), known.get('last_modified'))
+                else:
+                    unchanged = content_length is not None and content_length == known.get('content_length')
+                if unchanged:
+                    return None  # Closed before the body is read
+
+            path, content_hash = self._stream_to_file(response, dest_dir, max_bytes)
+
+        return {
+            'path': path,
+            'sha256': content_hash,
+            'etag': etag,
+            'last_modified': last_modified,
+            'content_length': content_length
+        }
+
+    def _stream_to_file(self, response, dest_dir: Optional[str], max_bytes: int) -> tuple[str, str]:
+        """Write a streamed response to a temp file; returns (path, sha256)"""
+        declared = int(response.headers.get('content-length') or 0)
+        if declared > max_bytes:
+            raise PDFTooLarge(f"PDF is {declared / (1024*1024):.1f}MB (limit {max_bytes / (1024*1024):.0f}MB)")
+
+        fd, path = tempfile.mkstemp(suffix='.pdf', dir=dest_dir)
+        digest = hashlib.sha256()
+        received = 0
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    received += len(chunk)
+                    if received > max_bytes:
+                        raise PDFTooLarge(f"PDF exceeded {max_bytes / (1024*1024):.0f}MB while downloading")
+                    digest.update(chunk)
+                    f.write(chunk)
+        except BaseException:
+            os.remove(path)
+            raise
+
+        return path, digest.hexdigest()
+
     def extract_from_url(self, pdf_url: str) -> Optional[Dict]:
         """Download and extract text from a PDF URL"""
         try:
-            response = self.session.get(pdf_url, timeout=30)
-            response.raise_for_status()
-            
-            # Read PDF from bytes
-            pdf_file = io.BytesIO(response.content)
-            return self.extract_from_file(pdf_file, source_url=pdf_url)
-            
+            path = self.download_to_file(pdf_url)
         except Exception as e:
             print(f"Error downloading PDF from {pdf_url}: {e}")
             return None
+
+        try:
+            return self.extract_from_file(path, source_url=pdf_url)
+        finally:
+            os.remove(path)
     
-    def extract_from_file(self, file_path_or_buffer, source_url: Optional[str] = None) -> Optional[Dict]:
+    def read_metadata(self, reader: PdfReader) -> Dict:
+        """Read document-level metadata from an open PDF"""
+        if not reader.metadata:
+            return {}
+
+        return {
+            'title': reader.metadata.get('/Title', ''),
+            'author': reader.metadata.get('/Author', ''),
+            'subject': reader.metadata.get('/Subject', ''),
+            'creator': reader.metadata.get('/Creator', ''),
+            'producer': reader.metadata.get('/Producer', ''),
+            'creation_date': reader.metadata.get('/CreationDate', '')
+        }
+
+    def read_info(self, file_path_or_buffer) -> Dict:
+        """Read title, metadata and page count without extracting any text"""
+        reader = PdfReader(file_path_or_buffer)
+        metadata = self.read_metadata(reader)
+        return {
+            'metadata': metadata,
+            'num_pages': len(reader.pages),
+            'title': metadata.get('title') or 'Untitled PDF'
+        }
+
+    def iter_pages(self, file_path_or_buffer, parallel: Optional[bool] = None,
+                   progress_callback=None, reader: Optional[PdfReader] = None) -> Iterator[Dict]:
+        """
+        Yield page dicts in page order.
+
+        Large PDFs on disk are split into page ranges and extracted by the
+        shared process pool; results are streamed back in order as each
+        range finishes. Buffers and small files are extracted in-process,
+        with the per-page time limit enforced by SIGALRM on the main thread
+        and by a helper-thread deadline elsewhere. Pages that come back
+        (nearly) empty are OCR'd when OCR is available.
+        """
+        pages = self._iter_text_pages(file_path_or_buffer, parallel, progress_callback, reader)
+        if self.enable_ocr and isinstance(file_path_or_buffer, (str, os.PathLike)):
+            pages = self._ocr_stage(os.fspath(file_path_or_buffer), pages)
+        return pages
+
+    def needs_ocr(self, page: Dict) -> bool:
+        """A page with almost no extractable text is probably a scanned image"""
+        return page['word_count'] < OCR_MIN_WORDS and not page.get('skipped')
+
+    def _ocr_stage(self, file_path: str, pages: Iterator[Dict]) -> Iterator[Dict]:
+        """
+        Send near-empty pages to an OCR worker pool, preserving page order.
+
+        Pages without images (blank pages) are skipped, and the shared pool
+        is only used once a page needs OCR, so text PDFs pay nothing. Up to
+        `window` pages are buffered while OCR is in flight.
+        """
+        window = self.max_workers * 4
+        buffered = deque()
+        reader = None
+
+        def has_images(page) -> bool:
+            nonlocal reader
+            try:
+                if reader is None:
+                    reader = PdfReader(file_path)
+                return len(reader.pages[page['page_number'] - 1].images) > 0
+            except Exception:
+                return True  # Let the OCR worker decide
+
+        def resolve(page, future):
+            if future is None:
+                return page
+            try:
+                text = future.result(timeout=OCR_TIMEOUT)
+            except Exception as e:
+                print(f"OCR failed for page {page['page_number']}: {e}")
+                return page
+            return {**page, 'text': text, 'word_count': len(text.split()), 'ocr': True}
+
+        try:
+            for page in pages:
+                future = None
+                if self.needs_ocr(page) and has_images(page):
+                    future = get_worker_pool().submit(ocr_page, file_path, page['page_number'] - 1,
+                                                      self.ocr_cache_dir)
+                buffered.append((page, future))
+
+                while buffered and (buffered[0][1] is None or buffered[0][1].done() or len(buffered) >= window):
+                    yield resolve(*buffered.popleft())
+
+            while buffered:
+                yield resolve(*buffered.popleft())
+        finally:
+            for _, future in buffered:
+                if future is not None:
+                    future.cancel()
+
+    def _iter_text_pages(self, file_path_or_buffer, parallel: Optional[bool],
+                         progress_callback, reader: Optional[PdfReader]) -> Iterator[Dict]:
+        """Yield pages from pypdf's text layer, in parallel for large files"""
+        reader = reader or PdfReader(file_path_or_buffer)
+        num_pages = len(reader.pages)
+
+        if parallel is None:
+            parallel = num_pages >= PARALLEL_MIN_PAGES and self.max_workers > 1
+        if not isinstance(file_path_or_buffer, (str, os.PathLike)):
+            parallel = False  # Workers need a path they can reopen
+
+        if not parallel:
+            for i in range(num_pages):
+                page = extract_page(reader, i, self.page_timeout)
+                if page['skipped'] and isinstance(file_path_or_buffer, (str, os.PathLike)):
+                    # An abandoned page may still be reading; don't share its reader
+                    reader = PdfReader(file_path_or_buffer)
+                if progress_callback:
+                    progress_callback(page['page_number'], num_pages)
+                yield page
+            return
+
+        ranges = [(start, min(start + PAGES_PER_TASK, num_pages))
+                  for start in range(0, num_pages, PAGES_PER_TASK)]
+        window = self.max_workers * 2  # Bound results held in memory
+
+        executor = get_worker_pool()
+        pending = []
+        next_range = 0
+        try:
+            while next_range < len(ranges) or pending:
+                while next_range < len(ranges) and len(pending) < window:
+                    start, end = ranges[next_range]
+                    future = executor.submit(extract_page_range, os.fspath(file_path_or_buffer),
+                                             start, end, self.page_timeout)
+                    pending.append((start, end, future))
+                    next_range += 1
+
+                start, end, future = pending.pop(0)
+                try:
+                    pages = future.result()
+                except Exception as e:
+                    print(f"Error extracting pages {start + 1}-{end}: {e}")
+                    pages = [
+                        {'page_number': i + 1, 'text': '', 'word_count': 0, 'skipped': True}
+                        for i in range(start, end)
+                    ]
+
+                for page in pages:
+                    if progress_callback:
+                        progress_callback(page['page_number'], num_pages)
+                    yield page
+        finally:
+            for _, _, future in pending:
+                future.cancel()  # The pool is shared; drop this PDF's queued ranges
+
+    def extract_from_file(self, file_path_or_buffer, source_url: Optional[str] = None,
+                          parallel: Optional[bool] = None) -> Optional[Dict]:
         """Extract text from a PDF file or buffer"""
         try:
             reader = PdfReader(file_path_or_buffer)
-            
-            # Get metadata
-            metadata = {}
-            if reader.metadata:
-                metadata = {
-                    'title': reader.metadata.get('/Title', ''),
-                    'author': reader.metadata.get('/Author', ''),
-                    'subject': reader.metadata.get('/Subject', ''),
-                    'creator': reader.metadata.get('/Creator', ''),
-                    'producer': reader.metadata.get('/Producer', ''),
-                    'creation_date': reader.metadata.get('/CreationDate', '')
-                }
-            
-            # Extract text from all pages
-            pages = []
-            full_text = []
-            
-            for i, page in enumerate(reader.pages):
-                page_text = page.extract_text()
-                pages.append({
-                    'page_number': i + 1,
-                    'text': page_text,
-                    'word_count': len(page_text.split())
-                })
-                full_text.append(page_text)
-            
-            combined_text = '\n\n'.join(full_text)
-            
-            # Clean up text
-            combined_text = re.sub(r'\s+', ' ', combined_text)
-            combined_text = combined_text.strip()
+            metadata = self.read_metadata(reader)
+            num_pages = len(reader.pages)
+
+            # Extract text from all pages (cleaned per page)
+            pages = list(self.iter_pages(file_path_or_buffer, parallel=parallel, reader=reader))
+            combined_text = ' '.join(page['text'] for page in pages if page['text'])
             
             return {
                 'source_url': source_url,
                 'metadata': metadata,
-                'num_pages': len(reader.pages),
+                'num_pages': num_pages,
                 'pages': pages,
+                'skipped_pages': [page['page_number'] for page in pages if page.get('skipped')],
                 'full_text': combined_text,
                 'word_count': len(combined_text.split()),
                 'title': metadata.get('title', 'Untitled PDF')
@@ -120,19 +531,144 @@ class PDFCollector:
             print(f"Error searching for PDFs: {e}")
         
         return pdf_links
-    
+
+    def is_pdf_link(self, url: str) -> bool:
+        """Check whether a URL points at a PDF by its path"""
+        return urlparse(url).path.lower().endswith('.pdf')
+
+    def discover_pdf_links(self, base_url: str, max_pages: int = 200, crawl_delay: float = 0.5,
+                           progress_callback=None) -> List[str]:
+        """
+        Crawl a site's HTML pages and collect every same-domain PDF link.
+
+        PDF links are recorded but never fetched during the crawl; URLs are
+        deduplicated after dropping fragments.
+        """
+        from bs4 import BeautifulSoup
+
+        def same_domain(url: str) -> bool:
+            return urlparse(url).netloc.replace('www.', '') == urlparse(base_url).netloc.replace('www.', '')
+
+        to_visit = [urldefrag(base_url)[0]]
+        queued: Set[str] = set(to_visit)
+        pdf_urls: Dict[str, None] = {}  # Insertion-ordered set
+        pages_scanned = 0
+
+        while to_visit and pages_scanned < max_pages:
+            url = to_visit.pop(0)
+            try:
+                response = self.session.get(url, timeout=15)
+                response.raise_for_status()
+            except Exception as e:
+                print(f"Error scanning {url} for PDFs: {e}")
+                continue
+
+            pages_scanned += 1
+            if 'html' not in response.headers.get('content-type', '').lower():
+                continue
+
+            soup = BeautifulSoup(response.content, 'html.parser')
+            for link in soup.find_all('a', href=True):
+                href = urldefrag(urljoin(url, link['href']))[0]
+                if not href.startswith(('http://', 'https://')) or not same_domain(href):
+                    continue
+                if self.is_pdf_link(href):
+                    pdf_urls.setdefault(href)
+                elif href not in queued:
+                    queued.add(href)
+                    to_visit.append(href)
+
+            if progress_callback:
+                progress_callback(pages_scanned, max_pages, len(pdf_urls))
+
+            time.sleep(crawl_delay)  # Be polite
+
+        print(f"PDF discovery: scanned {pages_scanned} pages, found {len(pdf_urls)} PDFs")
+        return list(pdf_urls)
+
+    def harvest_pdfs(self, pdf_urls: List[str], max_workers: int = 4,
+                     known_hashes: Optional[Set[str]] = None, dest_dir: Optional[str] = None,
+                     index: Optional[Dict[str, Dict]] = None) -> Iterator[Dict]:
+        """
+        Download PDFs concurrently and yield each new one as it lands on disk.
+
+        Downloads share one pooled session. `index` maps URLs to entries
+        from earlier harvests: unchanged URLs are skipped without
+        downloading (see download_if_changed). Files whose content hash was
+        already seen (in this run, `known_hashes` or `index`) are deleted,
+        recorded in `index` and not yielded. Yielded PDFs carry their
+        'entry'; callers add it to `index` once ingested, and own the
+        yielded temp files and must remove them.
+        """
+        index = index if index is not None else {}
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        seen_hashes = set(known_hashes or ()) | {entry['sha256'] for entry in index.values()}
+        urls = list(dict.fromkeys(urldefrag(u)[0] for u in pdf_urls))
+        window = max_workers * 2  # Bound temp files waiting on the consumer
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+            try:
+                yield from self._harvest_loop(executor, urls, pending, seen_hashes, window, dest_dir, index)
+            finally:
+                # Consumer stopped early: drop downloads nobody will ingest
+                for future in pending:
+                    if not future.cancel() and future.exception() is None and future.result():
+                        os.remove(future.result()['path'])
+
+    def _harvest_loop(self, executor, urls, pending, seen_hashes, window, dest_dir, index) -> Iterator[Dict]:
+        """Keep `window` downloads in flight and yield unique PDFs as they finish"""
+        next_url = 0
+        while next_url < len(urls) or pending:
+            while next_url < len(urls) and len(pending) < window:
+                url = urls[next_url]
+                pending[executor.submit(self.download_if_changed, url, index.get(url), dest_dir)] = url
+                next_url += 1
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = pending.pop(future)
+                try:
+                    download = future.result()
+                except Exception as e:
+                    print(f"Error downloading PDF from {url}: {e}")
+                    continue
+                if download is None:
+                    continue  # Unchanged since the last harvest
+
+                path = download.pop('path')
+                if download['sha256'] in seen_hashes:
+                    os.remove(path)
+                    index[url] = download
+                    continue
+                seen_hashes.add(download['sha256'])
+
+                yield {
+                    'url': url,
+                    'path': path,
+                    'sha256': download['sha256'],
+                    'file_size': os.path.getsize(path),
+                    'entry': download
+                }
+
     def collect_pdfs_from_site(self, base_url: str, max_pdfs: int = 10, progress_callback=None) -> List[Dict]:
         """Find and extract PDFs from a website"""
         
         # Find PDF links
-        pdf_urls = self.search_pdfs_in_website(base_url)[:max_pdfs]
+        pdf_urls = self.discover_pdf_links(base_url)[:max_pdfs]
         
         results = []
-        for i, pdf_url in enumerate(pdf_urls):
+        for i, pdf in enumerate(self.harvest_pdfs(pdf_urls)):
             if progress_callback:
-                progress_callback(i, len(pdf_urls), pdf_url)
+                progress_callback(i, len(pdf_urls), pdf['url'])
             
-            pdf_data = self.extract_from_url(pdf_url)
+            try:
+                pdf_data = self.extract_from_file(pdf['path'], source_url=pdf['url'])
+            finally:
+                os.remove(pdf['path'])
             if pdf_data:
                 results.append(pdf_data)
         
@@ -7,6 +7,8 @@ import os
 from typing import List, Dict, Optional
 import json
 
+from llm_clients import get_llm_client
+
 
 class SourceDiscovery:
     """AI-powered discovery of local data sources"""
@@ -25,12 +27,8 @@ class SourceDiscovery:
         else:
             self.model = "gpt-4o"
         
-        if provider == "openai":
-            from openai import OpenAI
-            self.client = OpenAI(api_key=self.api_key)
-        elif provider == "anthropic":
-            from anthropic import Anthropic
-            self.client = Anthropic(api_key=self.api_key)
+        if provider in ("openai", "anthropic"):
+            self.client = get_llm_client(provider, self.api_key)
     
     def discover_sources(self, municipality: str, neighborhood: Optional[str] = None, custom_prompt: Optional[str] = None) -> Dict:
         """Use AI to discover relevant data sources for a municipality"""
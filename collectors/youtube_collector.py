@@ -15,6 +15,14 @@ from googleapiclient.discovery import build
 from datetime import datetime
 
 
+def iso_upload_date(upload_date: str) -> str:
+    """yt-dlp's YYYYMMDD upload date as ISO 8601 (as the API gives), so date filters match it"""
+    try:
+        return datetime.strptime(upload_date, '%Y%m%d').date().isoformat()
+    except (TypeError, ValueError):
+        return upload_date or ''
+
+
 class YouTubeCollector:
     """Collects transcripts from YouTube playlists and videos with data protection limits"""
 
@@ -94,7 +102,7 @@ class YouTubeCollector:
                             'video_id': data.get('id', ''),
                             'title': data.get('title', 'Unknown'),
                             'description': data.get('description', ''),
-                            'published_at': data.get('upload_date', ''),
+                            'published_at': iso_upload_date(data.get('upload_date', '')),
                             'thumbnail': data.get('thumbnail', '')
                         }
                         videos.append(video_info)
@@ -40,4 +40,13 @@ api.interceptors.response.use(
   }
 );
 
+// Subscribe to server-sent ingestion job updates (optionally for one project).
+// Calls onJob with each job's state as it changes; returns an unsubscribe function.
+export const subscribeToJobs = (projectId, onJob) => {
+  const query = projectId ? `?project_id=${encodeURIComponent(projectId)}` : '';
+  const events = new EventSource(`${API_BASE_URL}/api/jobs/stream${query}`);
+  events.addEventListener('job', (event) => onJob(JSON.parse(event.data)));
+  return () => events.close();
+};
+
 export default api;
@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { useParams, Link, useNavigate } from 'react-router-dom';
-import api from '../api';
+import api, { subscribeToJobs } from '../api';
 import {
   ArrowLeftIcon,
   ServerIcon,
@@ -45,13 +45,13 @@ function AdminConsole() {
         api.get(`/api/projects/${projectId}`),
         api.get('/api/health'),
         api.get(`/api/projects/${projectId}/health`),
-        api.get('/api/admin/jobs')
+        api.get(`/api/admin/jobs?project_id=${encodeURIComponent(projectId)}`)
       ]);
 
       setProject(projectRes.data);
       setSystemHealth(systemHealthRes.data);
       setProjectHealth(projectHealthRes.data);
-      setJobs(jobsRes.data.jobs.filter(j => j.project_id === projectId));
+      setJobs(jobsRes.data.jobs);
 
       if (projectRes.data.project_api_key) {
         setApiKey(projectRes.data.project_api_key);
@@ -64,12 +64,37 @@ function AdminConsole() {
     }
   }, [projectId]);
 
+  const loadHealth = useCallback(async () => {
+    try {
+      const [systemHealthRes, projectHealthRes] = await Promise.all([
+        api.get('/api/health'),
+        api.get(`/api/projects/${projectId}/health`)
+      ]);
+      setSystemHealth(systemHealthRes.data);
+      setProjectHealth(projectHealthRes.data);
+    } catch (error) {
+      console.error('Error loading health:', error);
+    }
+  }, [projectId]);
+
   useEffect(() => {
     loadData();
-    // Auto-refresh every 10 seconds
-    const interval = setInterval(() => loadData(), 10000);
-    return () => clearInterval(interval);
-  }, [loadData]);
+    // Auto-refresh health every 10 seconds; jobs are pushed by the server
+    const interval = setInterval(() => loadHealth(), 10000);
+    const unsubscribe = subscribeToJobs(projectId, (job) => {
+      setJobs(prev => {
+        const index = prev.findIndex(j => j.job_id === job.job_id);
+        if (index === -1) return [...prev, job];
+        const next = [...prev];
+        next[index] = job;
+        return next;
+      });
+    });
+    return () => {
+      clearInterval(interval);
+      unsubscribe();
+    };
+  }, [loadData, loadHealth, projectId]);
 
   const generateApiKey = async () => {
     setGeneratingKey(true);
@@ -10,6 +10,7 @@ function ChatInterface() {
   const [loading, setLoading] = useState(false);
   const [project, setProject] = useState(null);
   const messagesEndRef = useRef(null);
+  const sessionIdRef = useRef(null);  // Server keeps the conversation history
 
   useEffect(() => {
     loadProject();
@@ -24,6 +25,10 @@ function ChatInterface() {
     try {
       const response = await api.get(`/api/projects/${projectId}`);
       setProject(response.data);
+      sessionIdRef.current = null;
+
+      // Load the model now so the first answer isn't a cold start
+      api.post(`/api/projects/${projectId}/warm`).catch(() => {});
 
       // Add welcome message
       setMessages([{
@@ -52,17 +57,13 @@ function ChatInterface() {
     setLoading(true);
 
     try {
-      // Prepare conversation history (last 5 messages)
-      const conversationHistory = newMessages.slice(-6, -1).map(msg => ({
-        role: msg.role,
-        content: msg.content
-      }));
-
+      // Only the new message is sent; history lives in the server-side session
       const response = await api.post('/api/chat', {
         project_id: projectId,
         message: userMessage,
-        conversation_history: conversationHistory
+        session_id: sessionIdRef.current
       });
+      sessionIdRef.current = response.data.session_id;
 
       // Add assistant response
       setMessages([...newMessages, {
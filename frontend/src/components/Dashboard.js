@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { useParams, Link } from 'react-router-dom';
-import api from '../api';
+import api, { subscribeToJobs } from '../api';
 import {
   DocumentTextIcon,
   ChatBubbleLeftRightIcon,
@@ -38,7 +38,7 @@ function Dashboard() {
       const [projectRes, statsRes, jobsRes] = await Promise.all([
         api.get(`/api/projects/${projectId}`),
         api.get(`/api/projects/${projectId}/stats`),
-        api.get('/api/admin/jobs')
+        api.get(`/api/admin/jobs?project_id=${encodeURIComponent(projectId)}`)
       ]);
 
       setProject(projectRes.data);
@@ -67,14 +67,20 @@ function Dashboard() {
 
   useEffect(() => {
     loadProjectData();
-    // Poll for updates if there are pending sources
-    const interval = setInterval(() => {
-      if (pendingSources.length > 0 || activeJobs.length > 0) {
-        loadProjectData();
+    // Job updates are pushed; reload stats only when an active job finishes
+    const activeJobIds = new Set();
+    return subscribeToJobs(projectId, (job) => {
+      if (job.status === 'running' || job.status === 'pending') {
+        activeJobIds.add(job.job_id);
+        setActiveJobs(prev => [...prev.filter(j => j.job_id !== job.job_id), job]);
+      } else {
+        setActiveJobs(prev => prev.filter(j => j.job_id !== job.job_id));
+        if (activeJobIds.delete(job.job_id)) {
+          loadProjectData();
+        }
       }
-    }, 5000);
-    return () => clearInterval(interval);
-  }, [loadProjectData, pendingSources.length, activeJobs.length]);
+    });
+  }, [loadProjectData, projectId]);
 
   const openConfigEditor = async () => {
     try {
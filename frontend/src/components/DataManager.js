@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { useParams, Link } from 'react-router-dom';
-import api from '../api';
+import api, { subscribeToJobs } from '../api';
 import {
   PlusIcon,
   TrashIcon,
@@ -32,6 +32,7 @@ function DataManager() {
   const [viewingDocuments, setViewingDocuments] = useState(null);
   const [documents, setDocuments] = useState([]);
   const [documentsLoading, setDocumentsLoading] = useState(false);
+  const [documentsCursor, setDocumentsCursor] = useState(null);
   const [selectedDoc, setSelectedDoc] = useState(null);
   const [syncingAll, setSyncingAll] = useState(false);
   const [syncErrors, setSyncErrors] = useState({});
@@ -55,10 +56,16 @@ function DataManager() {
     description: ''
   });
 
+  // Latest state for the job event handler, which outlives renders
+  const jobsRef = useRef(jobs);
+  const sourcesRef = useRef(sources);
+  jobsRef.current = jobs;
+  sourcesRef.current = sources;
+
   useEffect(() => {
     loadProject();
-    const interval = setInterval(updateJobStatuses, 2000);
-    return () => clearInterval(interval);
+    // Job progress is pushed by the server as it happens
+    return subscribeToJobs(projectId, handleJobEvent);
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [projectId]);
 
@@ -73,28 +80,21 @@ function DataManager() {
     }
   };
 
-  const updateJobStatuses = async () => {
-    const runningJobs = Object.values(jobs).filter(j => j.status === 'running' || j.status === 'pending');
-    for (const job of runningJobs) {
-      try {
-        const response = await api.get(`/api/jobs/${job.job_id}`);
-        const newJob = response.data;
-
-        // Check if job just completed or failed
-        if ((job.status === 'running' || job.status === 'pending') && newJob.status === 'completed') {
-          const source = sources.find(s => s.id === job.source_id);
-          addNotification(`Sync complete: ${source?.name || 'Source'}`, 'success');
-          loadProject(); // Reload to get updated word counts
-        } else if ((job.status === 'running' || job.status === 'pending') && newJob.status === 'failed') {
-          const source = sources.find(s => s.id === job.source_id);
-          addNotification(`Sync failed: ${source?.name || 'Source'} - ${newJob.error || 'Unknown error'}`, 'error');
-        }
-
-        setJobs(prev => ({ ...prev, [job.source_id]: newJob }));
-      } catch (error) {
-        console.error('Error updating job:', error);
-      }
+  const handleJobEvent = (newJob) => {
+    const job = jobsRef.current[newJob.source_id];
+    const wasActive = job && job.job_id === newJob.job_id && (job.status === 'running' || job.status === 'pending');
+
+    // Check if job just completed or failed
+    if (wasActive && newJob.status === 'completed') {
+      const source = sourcesRef.current.find(s => s.id === newJob.source_id);
+      addNotification(`Sync complete: ${source?.name || 'Source'}`, 'success');
+      loadProject(); // Reload to get updated word counts
+    } else if (wasActive && newJob.status === 'failed') {
+      const source = sourcesRef.current.find(s => s.id === newJob.source_id);
+      addNotification(`Sync failed: ${source?.name || 'Source'} - ${newJob.error || 'Unknown error'}`, 'error');
     }
+
+    setJobs(prev => ({ ...prev, [newJob.source_id]: newJob }));
   };
 
   const handleAddSource = async () => {
@@ -145,7 +145,8 @@ function DataManager() {
 
       addNotification(`Syncing: ${source?.name || 'Source'}...`, 'info');
 
-      setJobs(prev => ({
+      // The job stream may already have reported this job
+      setJobs(prev => prev[sourceId]?.job_id === jobId ? prev : ({
         ...prev,
         [sourceId]: {
           job_id: jobId,
@@ -200,7 +201,7 @@ function DataManager() {
         headers: { 'Content-Type': 'multipart/form-data' }
       });
 
-      setJobs(prev => ({
+      setJobs(prev => prev[response.data.source_id]?.job_id === response.data.job_id ? prev : ({
         ...prev,
         [response.data.source_id]: { job_id: response.data.job_id, status: 'pending', progress: 0, source_id: response.data.source_id }
       }));
@@ -222,10 +223,12 @@ function DataManager() {
     setViewingDocuments(source);
     setDocumentsLoading(true);
     setDocuments([]);
+    setDocumentsCursor(null);
 
     try {
       const response = await api.get(`/api/projects/${projectId}/documents?source_id=${source.id}&limit=50`);
       setDocuments(response.data.documents || []);
+      setDocumentsCursor(response.data.next_cursor);
     } catch (error) {
       console.error('Error loading documents:', error);
     } finally {
@@ -233,6 +236,31 @@ function DataManager() {
     }
   };
 
+  const loadMoreDocuments = async () => {
+    if (!viewingDocuments || !documentsCursor) return;
+
+    try {
+      const response = await api.get(
+        `/api/projects/${projectId}/documents?source_id=${viewingDocuments.id}&limit=50&cursor=${encodeURIComponent(documentsCursor)}`
+      );
+      setDocuments(prev => [...prev, ...(response.data.documents || [])]);
+      setDocumentsCursor(response.data.next_cursor);
+    } catch (error) {
+      console.error('Error loading documents:', error);
+    }
+  };
+
+  const selectDocument = async (doc) => {
+    // The list only carries a preview; fetch the full chunk on selection
+    setSelectedDoc(doc);
+    try {
+      const response = await api.get(`/api/projects/${projectId}/documents/${doc.id}`);
+      setSelectedDoc(current => (current?.id === doc.id ? response.data : current));
+    } catch (error) {
+      console.error('Error loading document:', error);
+    }
+  };
+
   const getCollectionMethodLabel = (source) => {
     const method = source.metadata?.collection_method;
     const methodLabels = {
@@ -240,6 +268,7 @@ function DataManager() {
       'web_scraper': 'Web page scraping',
       'pdf_url_download': 'PDF download & text extraction',
       'pdf_upload': 'Direct PDF upload',
+      'pdf_site_harvest': 'Site-wide PDF harvest',
       'unknown': 'Data collection'
     };
     return methodLabels[method] || methodLabels['unknown'];
@@ -254,6 +283,7 @@ function DataManager() {
         return <GlobeAmericasIcon className="h-5 w-5" />;
       case 'pdf_url':
       case 'pdf_upload':
+      case 'pdf_site':
         return <DocumentTextIcon className="h-5 w-5" />;
       default:
         return <LinkIcon className="h-5 w-5" />;
@@ -267,6 +297,7 @@ function DataManager() {
       'website': 'website',
       'pdf_url': 'pdf',
       'pdf_upload': 'pdf/upload',
+      'pdf_site': 'pdf/site',
       'rss_feed': 'rss',
       'reddit': 'reddit'
     };
@@ -428,6 +459,7 @@ function DataManager() {
                   <option value="youtube_video">youtube/video</option>
                   <option value="website">website</option>
                   <option value="pdf_url">pdf</option>
+                  <option value="pdf_site">pdf/site</option>
                   <option value="rss_feed">rss</option>
                 </select>
               </div>
@@ -616,7 +648,7 @@ function DataManager() {
                   documents.map((doc, idx) => (
                     <button
                       key={doc.id}
-                      onClick={() => setSelectedDoc(doc)}
+                      onClick={() => selectDocument(doc)}
                       className={`w-full text-left p-3 border-b border-gray-800 hover:bg-gray-800 transition-colors ${
                         selectedDoc?.id === doc.id ? 'bg-gray-800 border-l-2 border-l-purple-500' : ''
                       }`}
@@ -631,6 +663,14 @@ function DataManager() {
                     </button>
                   ))
                 )}
+                {!documentsLoading && documentsCursor && (
+                  <button
+                    onClick={loadMoreDocuments}
+                    className="w-full p-3 text-xs font-mono text-purple-400 hover:bg-gray-800 transition-colors"
+                  >
+                    Load more
+                  </button>
+                )}
               </div>
 
               {/* Document Content */}
@@ -35,25 +35,16 @@ function LandingPage() {
   const [chatMessages, setChatMessages] = useState([]);
   const [chatLoading, setChatLoading] = useState(false);
   const chatEndRef = useRef(null);
+  const chatSessionRef = useRef(null);  // Server keeps the conversation history
 
   // Load projects and check their health
   useEffect(() => {
     const loadProjects = async () => {
       try {
-        const response = await api.get('/api/projects');
-        setProjects(response.data);
-
-        // Check health for each project
-        const healthStatuses = {};
-        for (const project of response.data) {
-          try {
-            const healthRes = await api.get(`/api/projects/${project.project_id}/health`);
-            healthStatuses[project.project_id] = healthRes.data;
-          } catch (err) {
-            healthStatuses[project.project_id] = { ready: false, issues: ['Unable to check health'] };
-          }
-        }
-        setProjectsHealth(healthStatuses);
+        // One request returns every project with its health
+        const response = await api.get('/api/projects/health');
+        setProjects(response.data.projects || []);
+        setProjectsHealth(response.data.health || {});
       } catch (err) {
         console.error('Error loading projects:', err);
       }
@@ -72,6 +63,8 @@ function LandingPage() {
     if (!health?.ready) return; // Don't open if not ready
 
     setActiveChat(project);
+    chatSessionRef.current = null;
+    api.post(`/api/projects/${project.project_id}/warm`).catch(() => {});
     setChatMessages([{
       role: 'assistant',
       content: `Hi! I'm ${project.project_name}. Ask me anything about ${project.municipality_name}!`
@@ -79,6 +72,10 @@ function LandingPage() {
   };
 
   const closeChat = () => {
+    if (chatSessionRef.current) {
+      api.delete(`/api/projects/${activeChat.project_id}/chat/sessions/${chatSessionRef.current}`).catch(() => {});
+      chatSessionRef.current = null;
+    }
     setActiveChat(null);
     setChatMessages([]);
     setChatInput('');
@@ -96,8 +93,9 @@ function LandingPage() {
       const response = await api.post('/api/chat', {
         project_id: activeChat.project_id,
         message: userMessage,
-        conversation_history: chatMessages.slice(-5).map(m => ({ role: m.role, content: m.content }))
+        session_id: chatSessionRef.current
       });
+      chatSessionRef.current = response.data.session_id;
 
       setChatMessages(prev => [...prev, {
         role: 'assistant',
@@ -26,6 +26,7 @@ function Settings() {
   const [modelName, setModelName] = useState('');
   const [customModelName, setCustomModelName] = useState('');
   const [isCustomModel, setIsCustomModel] = useState(false);
+  const [fastModelName, setFastModelName] = useState('');
   const [apiKey, setApiKey] = useState('');
   const [temperature, setTemperature] = useState(0.7);
   const [systemPrompt, setSystemPrompt] = useState('');
@@ -51,6 +52,7 @@ function Settings() {
       const data = response.data;
       setAiProvider(data.ai_provider || 'ollama');
       setApiKey(data.api_key || '');
+      setFastModelName(data.fast_model_name || '');
       setTemperature(data.temperature || 0.7);
       setSystemPrompt(data.system_prompt || '');
       setShowThinking(data.show_thinking || false);
@@ -120,6 +122,7 @@ function Settings() {
       await api.put(`/api/projects/${projectId}`, {
         ai_provider: aiProvider,
         model_name: finalModelName,
+        fast_model_name: fastModelName.trim() || null,
         api_key: apiKey || null,
         temperature: temperature,
         system_prompt: systemPrompt,
@@ -297,6 +300,20 @@ function Settings() {
                 </div>
               )}
             </div>
+
+            <div>
+              <label className="block text-sm font-mono text-gray-300 mb-2">--fast-model <span className="text-gray-500">(optional)</span></label>
+              <input
+                type="text"
+                value={fastModelName}
+                onChange={(e) => setFastModelName(e.target.value)}
+                placeholder={aiProvider === 'ollama' ? 'e.g., llama3.2:3b' : aiProvider === 'openai' ? 'e.g., gpt-4o-mini' : 'e.g., claude-3-5-haiku-latest'}
+                className="w-full px-4 py-3 bg-gray-800 border border-gray-600 rounded-lg text-white font-mono placeholder-gray-500 focus:ring-2 focus:ring-green-500"
+              />
+              <p className="mt-1 text-xs text-gray-500 font-mono">
+                # Answers simple lookups (hours, dates, contacts); other questions use --model
+              </p>
+            </div>
           </div>
 
           {(aiProvider === 'openai' || aiProvider === 'anthropic') && (
@@ -0,0 +1,87 @@
+"""
+Job Events
+Pushes ingestion job state changes to subscribers as server-sent events
+"""
+
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from models import DataIngestionJob
+
+
+PROGRESS_INTERVAL = 0.25  # Min seconds between progress events for one job
+KEEPALIVE_INTERVAL = 15  # Seconds between comments that keep proxies from closing the stream
+SUBSCRIBER_QUEUE_SIZE = 100  # Oldest events are dropped for slow subscribers
+
+
+class JobEventBus:
+    """
+    Fans out DataIngestionJob updates to SSE subscribers.
+
+    publish() may be called from ingestion worker threads; events are handed
+    to the event loop thread-safely. Progress updates for one job are
+    throttled, while status changes are always sent.
+    """
+
+    def __init__(self):
+        self._subscribers: List[Tuple[asyncio.Queue, Optional[str]]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._last_sent: Dict[str, Tuple[str, float]] = {}
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """Attach to the server's event loop (call on startup)"""
+        self._loop = loop
+
+    def publish(self, job: DataIngestionJob):
+        """Publish a job's current state to subscribers of its project"""
+        if self._loop is None or not self._subscribers:
+            return
+
+        now = time.monotonic()
+        last_status, last_time = self._last_sent.get(job.job_id, (None, 0.0))
+        if job.status == last_status and now - last_time < PROGRESS_INTERVAL:
+            return
+        if job.status in ("completed", "failed"):
+            self._last_sent.pop(job.job_id, None)
+        else:
+            self._last_sent[job.job_id] = (job.status, now)
+
+        event = job.model_dump(mode='json')
+        try:
+            self._loop.call_soon_threadsafe(self._dispatch, event)
+        except RuntimeError:
+            pass  # Loop closed during shutdown
+
+    def _dispatch(self, event: Dict):
+        for queue, project_id in list(self._subscribers):
+            if project_id and event['project_id'] != project_id:
+                continue
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def stream(self, project_id: Optional[str] = None,
+                     initial: Iterable[DataIngestionJob] = ()) -> AsyncIterator[str]:
+        """Yield SSE frames: the given jobs' current state, then live updates"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        subscriber = (queue, project_id)
+        self._subscribers.append(subscriber)
+
+        try:
+            for job in initial:
+                yield self._format(job.model_dump(mode='json'))
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield self._format(event)
+        finally:
+            self._subscribers.remove(subscriber)
+
+    def _format(self, event: Dict) -> str:
+        return f"event: job\ndata: {json.dumps(event)}\n\n"
@@ -0,0 +1,87 @@
+"""
+LLM Clients
+Shared, connection-pooled OpenAI and Anthropic clients
+"""
+
+import hashlib
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+
+MAX_CONNECTIONS = 20  # Per client (provider + credential)
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY = 120  # Seconds an idle connection stays open
+CONNECT_TIMEOUT = 10
+REQUEST_TIMEOUT = 600  # Long completions from large models
+
+API_KEY_ENV = {"openai": "OPENAI_API_KEY", "anthropic": "ANTHROPIC_API_KEY"}
+
+_clients: Dict[Tuple[str, str], Any] = {}
+_lock = threading.Lock()
+
+
+def credential_key(api_key: Optional[str]) -> str:
+    """Short hash identifying a credential without keeping it as a key"""
+    return hashlib.sha256((api_key or "").encode()).hexdigest()[:12]
+
+
+def get_llm_client(provider: str, api_key: Optional[str] = None):
+    """
+    Get the shared client for a provider and credential (api_key, else
+    the provider's env var).
+
+    Clients are created once and reused by every agent and discovery call
+    with the same credential, so their pooled connections stay warm.
+    """
+    api_key = api_key or os.getenv(API_KEY_ENV.get(provider, ""))
+    key = (provider, credential_key(api_key))
+
+    with _lock:
+        if key in _clients:
+            return _clients[key]
+
+        if provider == "openai":
+            from openai import OpenAI as client_class
+        elif provider == "anthropic":
+            from anthropic import Anthropic as client_class
+        else:
+            raise ValueError(f"Unknown LLM provider: {provider}")
+
+        http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT)
+        )
+        try:
+            client = client_class(api_key=api_key, http_client=http_client)
+        except TypeError as e:
+            # SDK built on a different HTTP library; keep its default pool
+            http_client.close()
+            print(f"Using default {provider} connection pool: {e}")
+            client = client_class(api_key=api_key)
+        except Exception:
+            http_client.close()
+            raise
+
+        _clients[key] = client
+        return client
+
+
+def client_stats() -> List[Dict]:
+    """Shared clients by provider and credential hash"""
+    with _lock:
+        return [{"provider": provider, "credential": credential} for provider, credential in _clients]
+
+
+def close_all():
+    """Close every shared client's connections (call on shutdown)"""
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
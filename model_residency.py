@@ -0,0 +1,128 @@
+"""
+Model Residency
+Pre-loads configured Ollama models and keeps them resident between chats
+"""
+
+import asyncio
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from agent import base_num_ctx
+from models import ProjectConfig
+from provider_status import ProviderStatus
+
+
+STARTUP_WARM_MODELS = 2  # Most used Ollama models loaded at startup
+WARM_COOLDOWN = 60  # Seconds before a loaded model is warmed again
+STARTUP_PROBE_WAIT = 10  # Seconds to wait for the first provider probe
+
+
+class ModelResidency:
+    """
+    Warms Ollama models with an empty generate request, which loads the
+    model and sets how long it stays resident (keep_alive) without
+    generating anything.
+
+    Residency comes from the provider status probe (/api/ps); the load
+    time of each warm-up is recorded so cold starts are visible.
+    """
+
+    def __init__(self, provider_status: ProviderStatus):
+        self.provider_status = provider_status
+        self.models: Dict[str, Dict] = {}  # Last warm-up per model
+        self._warming: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def warm(self, model_name: str, keep_alive, num_ctx: Optional[int] = None) -> bool:
+        """
+        Load a model (if installed) and set its keep-alive window. num_ctx
+        should match what chats will request, or the first chat reloads it.
+        """
+        status = self.provider_status
+        if not status.ollama_running or not status.has_model(model_name):
+            return False
+        if model_name in self._warming:
+            return True
+
+        last = self.models.get(model_name)
+        if (status.is_loaded(model_name) and last and last['keep_alive'] == keep_alive
+                and time.time() - last['warmed_at'] < WARM_COOLDOWN):
+            return True
+
+        self._warming.add(model_name)
+        try:
+            import ollama
+            started = time.monotonic()
+            options = {"num_ctx": num_ctx} if num_ctx else None
+            response = await asyncio.to_thread(
+                ollama.generate, model=model_name, prompt='', keep_alive=keep_alive, options=options
+            )
+            load_seconds = (response.get('load_duration') or 0) / 1e9
+            self.models[model_name] = {
+                "keep_alive": keep_alive,
+                "num_ctx": num_ctx,
+                "warmed_at": time.time(),
+                "load_seconds": round(load_seconds, 2),
+                "warm_seconds": round(time.monotonic() - started, 2)
+            }
+            status.mark_loaded(model_name)
+            print(f"Warmed Ollama model {model_name} (load {load_seconds:.1f}s, keep_alive={keep_alive})")
+            return True
+        except Exception as e:
+            print(f"Could not warm Ollama model {model_name}: {e}")
+            return False
+        finally:
+            self._warming.discard(model_name)
+
+    def start_task(self, coro) -> bool:
+        """Run a warm-up in the background (needs a running event loop)"""
+        try:
+            task = asyncio.get_running_loop().create_task(coro)
+        except RuntimeError:
+            coro.close()  # Not on the event loop (e.g. a worker thread)
+            return False
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    def warm_project(self, project: ProjectConfig) -> bool:
+        """Warm a project's models in the background if it uses Ollama"""
+        if project.ai_provider != "ollama":
+            return False
+        num_ctx = base_num_ctx(project)
+        if project.fast_model_name:
+            self.start_task(self.warm(project.fast_model_name, project.keep_alive, num_ctx))
+        return self.start_task(self.warm(project.model_name, project.keep_alive, num_ctx))
+
+    async def warm_projects(self, load_projects: Callable[[], Iterable[ProjectConfig]],
+                            limit: int = STARTUP_WARM_MODELS):
+        """Warm the Ollama models most projects use (at startup)"""
+        deadline = time.monotonic() + STARTUP_PROBE_WAIT
+        while self.provider_status.checked_at is None and time.monotonic() < deadline:
+            await asyncio.sleep(0.5)
+
+        projects = await asyncio.to_thread(load_projects)
+
+        first_project = {}
+        counts = Counter()
+        for project in projects:
+            if project.ai_provider == "ollama":
+                counts[project.model_name] += 1
+                first_project.setdefault(project.model_name, project)
+
+        for model_name, _ in counts.most_common(limit):
+            project = first_project[model_name]
+            await self.warm(model_name, project.keep_alive, base_num_ctx(project))
+
+    def snapshot(self, model_name: Optional[str] = None) -> Dict:
+        """Residency and last warm-up, for one model or all configured ones"""
+        names = [model_name] if model_name else sorted(self.models)
+        return {
+            name: {
+                "loaded": self.provider_status.is_loaded(name),
+                **self.provider_status.ollama_loaded.get(name, {}),
+                **self.models.get(name, {})
+            }
+            for name in names
+        }
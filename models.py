@@ -47,6 +47,7 @@ class DataSourceType(str, Enum):
     WEBSITE = "website"
     PDF_URL = "pdf_url"
     PDF_UPLOAD = "pdf_upload"
+    PDF_SITE = "pdf_site"  # Every PDF linked from a site (document centers)
     RSS_FEED = "rss_feed"
     REDDIT = "reddit"
 
@@ -64,6 +65,13 @@ class DataSource(BaseModel):
     metadata: Dict[str, Any] = {}
 
 
+class FallbackModel(BaseModel):
+    """A provider/model tried when the project's own model fails or is slow"""
+    ai_provider: AIProvider
+    model_name: str
+    api_key: Optional[str] = None  # Defaults to the provider's env var
+
+
 class ProjectConfig(BaseModel):
     """Main configuration for a neighborhood AI project"""
 
@@ -76,7 +84,11 @@ class ProjectConfig(BaseModel):
     # AI Configuration
     ai_provider: AIProvider = AIProvider.OLLAMA
     model_name: str = "llama3.1:8b"
+    fast_model_name: Optional[str] = None  # Same provider, smaller model for simple lookups (e.g. "llama3.2:3b")
     api_key: Optional[str] = None  # For OpenAI/Anthropic
+    fallback_models: List[FallbackModel] = []  # Tried in order when the model above fails
+    provider_timeout: int = Field(default=120, ge=5, le=600)  # Seconds before failing over (with fallbacks)
+    hedge_requests: bool = False  # Also ask the first fallback once the model is slower than its p95
 
     # Project API Access
     project_api_key: Optional[str] = None  # API key for external access to this project
@@ -86,6 +98,9 @@ class ProjectConfig(BaseModel):
     temperature: float = Field(default=0.7, ge=0.0, le=2.0)
     max_tokens: int = Field(default=2000, ge=100, le=8000)
     context_window: int = Field(default=8192, ge=2048, le=32768)
+    history_token_budget: int = Field(default=1500, ge=0, le=16000)  # Verbatim conversation history per turn
+    retrieval_min_score: float = Field(default=0.25, ge=0.0, le=1.0)  # Search results scoring lower are left out of the prompt
+    keep_alive: Union[str, int] = "30m"  # How long Ollama keeps the model loaded after a request (-1 = forever)
     
     def model_post_init(self, __context):
         """Set appropriate model defaults based on provider"""
@@ -135,7 +150,14 @@ class ChatMessage(BaseModel):
 class ChatRequest(BaseModel):
     message: str
     project_id: str
-    conversation_history: List[ChatMessage] = []
+    session_id: Optional[str] = None  # Server-side history; returned by /api/chat
+    conversation_history: List[ChatMessage] = []  # Only used to seed a new session
+
+
+class ApiChatRequest(BaseModel):
+    """Chat through a project API key (the key selects the project)"""
+    message: str
+    session_id: Optional[str] = None
 
 
 class DataIngestionJob(BaseModel):
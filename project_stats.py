@@ -0,0 +1,86 @@
+"""
+Project Stats
+In-memory per-project counters behind the stats and health endpoints
+"""
+
+import os
+import threading
+from typing import Dict
+
+from models import ProjectConfig
+from vector_store import get_qdrant_client
+
+
+class ProjectStats:
+    """
+    Caches vector point counts and data source totals per project.
+
+    Counts are read from the shared Qdrant client once, then refreshed only
+    when ingestion writes or a project changes, so polling the stats and
+    health endpoints never opens a client or loads an encoder.
+    """
+
+    def __init__(self, data_dir: str = "./data"):
+        self.data_dir = data_dir
+        self._stats: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, project: ProjectConfig) -> Dict:
+        """Get cached stats for a project, counting points on first access"""
+        stats = self._stats.get(project.project_id)
+        if stats is None:
+            with self._lock:
+                stats = {**self._source_totals(project), **self._count_points(project.project_id)}
+                self._stats[project.project_id] = stats
+        return dict(stats)
+
+    def update_sources(self, project: ProjectConfig):
+        """Recompute data source totals after the project config changes"""
+        with self._lock:
+            stats = self._stats.get(project.project_id)
+            if stats is not None:
+                stats.update(self._source_totals(project))
+
+    def refresh_points(self, project_id: str):
+        """Re-read the point count after ingestion wrote to the collection"""
+        with self._lock:
+            stats = self._stats.get(project_id)
+            if stats is not None:
+                stats.update(self._count_points(project_id))
+
+    def remove(self, project_id: str):
+        """Forget a deleted project"""
+        with self._lock:
+            self._stats.pop(project_id, None)
+
+    def _count_points(self, project_id: str) -> Dict:
+        """
+        Count points through the shared client.
+
+        Upserts with content-derived IDs can overwrite existing points, so
+        the count is re-read after writes rather than adjusted by batch size.
+        """
+        qdrant_path = f"{self.data_dir}/{project_id}/qdrant"
+        if not os.path.exists(qdrant_path):
+            return {'vector_documents': 0, 'vector_error': None}
+
+        try:
+            client = get_qdrant_client(qdrant_path)
+            if not client.collection_exists(project_id):
+                return {'vector_documents': 0, 'vector_error': None}
+            count = client.count(collection_name=project_id, exact=True).count
+            return {'vector_documents': count, 'vector_error': None}
+        except Exception as e:
+            print(f"Error getting vector stats: {e}")
+            return {'vector_documents': 0, 'vector_error': str(e)}
+
+    def _source_totals(self, project: ProjectConfig) -> Dict:
+        """Summarize data sources from the project config"""
+        sources = project.data_sources
+        return {
+            'total_sources': len(sources),
+            'active_sources': len([s for s in sources if s.enabled]),
+            'synced_sources': len([s for s in sources if s.last_synced]),
+            'total_words': sum(s.word_count for s in sources if s.word_count),
+            'total_chunks': sum(s.document_count for s in sources if s.document_count)
+        }
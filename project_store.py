@@ -0,0 +1,255 @@
+"""
+Project Store
+Atomic, coalesced persistence of project configs and the project catalog
+"""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from models import ProjectConfig
+
+
+SAVE_DELAY = 0.5  # Seconds to coalesce successive saves of one project
+CATALOG_FILE = "catalog.json"
+
+
+def atomic_write(path: str, data: str):
+    """Write a file via a temp file renamed over it"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp.", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def catalog_entry(project: ProjectConfig) -> Dict:
+    """Listing fields for a project"""
+    def iso(value):
+        return value.isoformat() if isinstance(value, datetime) else value
+
+    return {
+        "project_id": project.project_id,
+        "municipality_name": project.municipality_name,
+        "project_name": project.project_name,
+        "ai_provider": project.ai_provider.value if hasattr(project.ai_provider, 'value') else project.ai_provider,
+        "model_name": project.model_name,
+        "created_at": iso(project.created_at),
+        "updated_at": iso(project.updated_at)
+    }
+
+
+class ProjectRepository:
+    """
+    In-memory project configs backed by ./data/<project_id>/config.json.
+
+    Saves are coalesced: the first save of a project schedules a write
+    SAVE_DELAY seconds later and further saves before then ride along with
+    it. Writes go to a temp file that is renamed over config.json, so a
+    crash never leaves a half-written config. Mutations made through
+    update() hold the project's lock, so concurrent ingestion jobs and
+    settings changes never overwrite each other's fields.
+
+    A catalog of listing fields is kept in ./data/catalog.json, so listing
+    and counting projects never scans the data directory or parses configs.
+    It is rebuilt from the configs on disk if missing.
+    """
+
+    def __init__(self, data_dir: str = "./data", save_delay: float = SAVE_DELAY):
+        self.data_dir = data_dir
+        self.save_delay = save_delay
+        self.projects: Dict[str, ProjectConfig] = {}
+        self._locks: Dict[str, threading.RLock] = {}
+        self._locks_guard = threading.Lock()
+        self._timers: Dict[str, threading.Timer] = {}
+        self._catalog: Optional[Dict[str, Dict]] = None
+        self._catalog_lock = threading.RLock()
+        self._catalog_timer: Optional[threading.Timer] = None
+
+    def lock(self, project_id: str) -> threading.RLock:
+        """Get the lock guarding a project's config"""
+        with self._locks_guard:
+            if project_id not in self._locks:
+                self._locks[project_id] = threading.RLock()
+            return self._locks[project_id]
+
+    def config_path(self, project_id: str) -> str:
+        return f"{self.data_dir}/{project_id}/config.json"
+
+    def get(self, project_id: str) -> Optional[ProjectConfig]:
+        """Get a project, loading it from disk on first access"""
+        if project_id in self.projects:
+            return self.projects[project_id]
+
+        path = self.config_path(project_id)
+        if not os.path.exists(path):
+            return None
+
+        with self.lock(project_id):
+            if project_id not in self.projects:
+                with open(path, 'r') as f:
+                    self.projects[project_id] = ProjectConfig(**json.load(f))
+            return self.projects[project_id]
+
+    def all(self) -> List[ProjectConfig]:
+        """Load every project on disk"""
+        if os.path.exists(self.data_dir):
+            for project_id in os.listdir(self.data_dir):
+                if project_id not in self.projects:
+                    self.get(project_id)
+
+        return list(self.projects.values())
+
+    def save(self, project: ProjectConfig):
+        """Store a project (replacing any cached copy) and schedule a write"""
+        with self.lock(project.project_id):
+            self.projects[project.project_id] = project
+            self._schedule(project.project_id)
+        self._update_catalog(project)
+
+    def update(self, project_id: str, fn: Callable[[ProjectConfig], None]) -> Optional[ProjectConfig]:
+        """
+        Apply fn to the current project under its lock and schedule a write.
+
+        Use this from background jobs instead of mutating a project object
+        captured earlier, which may since have been replaced.
+        """
+        with self.lock(project_id):
+            project = self.get(project_id)
+            if project is None:
+                return None
+            fn(project)
+            self._schedule(project_id)
+        self._update_catalog(project)
+        return project
+
+    def remove(self, project_id: str):
+        """Forget a project and drop any pending write"""
+        with self.lock(project_id):
+            timer = self._timers.pop(project_id, None)
+            if timer:
+                timer.cancel()
+            self.projects.pop(project_id, None)
+
+        with self._catalog_lock:
+            if self._load_catalog().pop(project_id, None) is not None:
+                self._write_catalog()
+
+    def flush(self, project_id: Optional[str] = None):
+        """Write pending saves now (one project, or all plus the catalog on shutdown)"""
+        project_ids = [project_id] if project_id else list(self._timers)
+        for pid in project_ids:
+            with self.lock(pid):
+                timer = self._timers.pop(pid, None)
+                if timer:
+                    timer.cancel()
+                    self._write(pid)
+
+        if project_id is None:
+            with self._catalog_lock:
+                if self._catalog_timer:
+                    self._write_catalog()
+
+    def catalog(self) -> List[Dict]:
+        """Listing fields for every project"""
+        with self._catalog_lock:
+            return list(self._load_catalog().values())
+
+    def count(self) -> int:
+        """Number of projects"""
+        with self._catalog_lock:
+            return len(self._load_catalog())
+
+    def _load_catalog(self) -> Dict[str, Dict]:
+        """Read the catalog, rebuilding it from configs if missing (caller holds the catalog lock)"""
+        if self._catalog is not None:
+            return self._catalog
+
+        path = f"{self.data_dir}/{CATALOG_FILE}"
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    entries = json.load(f)
+                # Drop projects whose directory was removed while the server was down
+                self._catalog = {
+                    entry['project_id']: entry for entry in entries
+                    if os.path.exists(self.config_path(entry['project_id']))
+                }
+                return self._catalog
+            except Exception as e:
+                print(f"Error reading project catalog, rebuilding: {e}")
+
+        self._catalog = {p.project_id: catalog_entry(p) for p in self.all()}
+        self._schedule_catalog()
+        return self._catalog
+
+    def _update_catalog(self, project: ProjectConfig):
+        """Refresh a project's catalog entry, writing only if it changed"""
+        entry = catalog_entry(project)
+        with self._catalog_lock:
+            catalog = self._load_catalog()
+            if catalog.get(project.project_id) == entry:
+                return
+            is_new = project.project_id not in catalog
+            catalog[project.project_id] = entry
+            # New projects are written at once; renames can be coalesced
+            if is_new:
+                self._write_catalog()
+            else:
+                self._schedule_catalog()
+
+    def _schedule_catalog(self):
+        if self._catalog_timer is not None:
+            return
+
+        self._catalog_timer = threading.Timer(self.save_delay, self._write_catalog)
+        self._catalog_timer.daemon = True
+        self._catalog_timer.start()
+
+    def _write_catalog(self):
+        with self._catalog_lock:
+            if self._catalog_timer is not None:
+                self._catalog_timer.cancel()
+                self._catalog_timer = None
+            try:
+                os.makedirs(self.data_dir, exist_ok=True)
+                atomic_write(f"{self.data_dir}/{CATALOG_FILE}",
+                             json.dumps(list(self._catalog.values()), indent=2))
+            except Exception as e:
+                print(f"Error saving project catalog: {e}")
+
+    def _schedule(self, project_id: str):
+        """Schedule a write unless one is already pending (caller holds the lock)"""
+        if project_id in self._timers:
+            return
+
+        timer = threading.Timer(self.save_delay, self._write_pending, args=(project_id,))
+        timer.daemon = True
+        self._timers[project_id] = timer
+        timer.start()
+
+    def _write_pending(self, project_id: str):
+        with self.lock(project_id):
+            if self._timers.pop(project_id, None) is not None:
+                self._write(project_id)
+
+    def _write(self, project_id: str):
+        """Atomically write a project's config (caller holds the lock)"""
+        project = self.projects.get(project_id)
+        if project is None:
+            return  # Deleted while the write was pending
+
+        os.makedirs(os.path.dirname(self.config_path(project_id)), exist_ok=True)
+
+        try:
+            atomic_write(self.config_path(project_id), json.dumps(project.model_dump(), indent=2, default=str))
+        except Exception as e:
+            print(f"Error saving project {project_id}: {e}")
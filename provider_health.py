@@ -0,0 +1,132 @@
+"""
+Provider Health
+Rolling latency and error rates per LLM provider/model, with a circuit breaker
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+
+WINDOW_SIZE = 50  # Recent calls kept per provider/model
+MIN_SAMPLES = 5  # Calls needed before p95 is trusted
+FAILURES_TO_OPEN = 3  # Consecutive failures that open the circuit
+ERROR_RATE_TO_OPEN = 0.5  # Or this error rate over the window (with MIN_SAMPLES)
+OPEN_SECONDS = 30  # How long an open circuit skips the provider before a trial call
+STALE_CALL_SECONDS = 300  # An unfinished call older than this no longer blocks a trial
+
+
+class _Target:
+    def __init__(self):
+        self.calls: Deque[Tuple[float, bool]] = deque(maxlen=WINDOW_SIZE)  # (seconds, ok)
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_at: Optional[float] = None  # When the current trial call was allowed
+        self.in_flight: Dict[int, float] = {}  # Unfinished calls (abandoned ones too) -> start time
+
+
+class ProviderHealth:
+    """
+    Tracks calls per target ("provider:model"). A target's circuit opens
+    after repeated failures; while open the target is skipped, and after
+    OPEN_SECONDS a single trial call decides whether it closes again. No
+    trial starts while an earlier call to the target is still running,
+    so abandoned calls to a hung provider don't pile up.
+    """
+
+    def __init__(self):
+        self._targets: Dict[str, _Target] = {}
+        self._lock = threading.Lock()
+        self._call_ids = itertools.count()
+
+    def _get(self, key: str) -> _Target:
+        target = self._targets.get(key)
+        if target is None:
+            target = self._targets[key] = _Target()
+        return target
+
+    def allow(self, key: str) -> bool:
+        """Whether a call may go to this target now (claims the trial if half-open)"""
+        with self._lock:
+            target = self._get(key)
+            if target.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - target.opened_at < OPEN_SECONDS:
+                return False
+            if target.trial_at is not None and now - target.trial_at < OPEN_SECONDS:
+                return False  # A trial is already under way
+            if any(now - started < STALE_CALL_SECONDS for started in target.in_flight.values()):
+                return False  # An earlier (maybe abandoned) call hasn't returned yet
+            target.trial_at = now
+            return True
+
+    def begin(self, key: str) -> int:
+        """Note a call starting; pass the returned ID to end() when it returns"""
+        with self._lock:
+            call_id = next(self._call_ids)
+            self._get(key).in_flight[call_id] = time.monotonic()
+            return call_id
+
+    def end(self, key: str, call_id: int):
+        """Note a call returning, whether or not anyone still waits for it"""
+        with self._lock:
+            self._get(key).in_flight.pop(call_id, None)
+
+    def record(self, key: str, seconds: float, ok: bool):
+        with self._lock:
+            target = self._get(key)
+            target.calls.append((seconds, ok))
+            target.trial_at = None
+            if ok:
+                target.consecutive_failures = 0
+                target.opened_at = None
+                return
+
+            target.consecutive_failures += 1
+            errors = sum(1 for _, call_ok in target.calls if not call_ok)
+            if (target.consecutive_failures >= FAILURES_TO_OPEN or target.opened_at is not None
+                    or (len(target.calls) >= MIN_SAMPLES and errors / len(target.calls) >= ERROR_RATE_TO_OPEN)):
+                if target.opened_at is None:
+                    print(f"Circuit open for {key} after {target.consecutive_failures} failures")
+                target.opened_at = time.monotonic()
+
+    def p95(self, key: str) -> Optional[float]:
+        """95th percentile latency of recent successful calls (None until MIN_SAMPLES)"""
+        with self._lock:
+            target = self._targets.get(key)
+            latencies = sorted(s for s, ok in target.calls if ok) if target else []
+        if len(latencies) < MIN_SAMPLES:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    def average(self, key: str) -> Optional[float]:
+        """Average latency of recent successful calls (None if there are none)"""
+        with self._lock:
+            target = self._targets.get(key)
+            latencies = [s for s, ok in target.calls if ok] if target else []
+        return sum(latencies) / len(latencies) if latencies else None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            keys = list(self._targets)
+        result = {}
+        for key in keys:
+            with self._lock:
+                target = self._targets[key]
+                calls = list(target.calls)
+                circuit = "closed" if target.opened_at is None else "open"
+            latencies = [s for s, ok in calls if ok]
+            result[key] = {
+                "calls": len(calls),
+                "error_rate": round(sum(1 for _, ok in calls if not ok) / len(calls), 2) if calls else 0.0,
+                "avg_seconds": round(sum(latencies) / len(latencies), 2) if latencies else None,
+                "p95_seconds": round(self.p95(key), 2) if self.p95(key) is not None else None,
+                "circuit": circuit
+            }
+        return result
+
+
+provider_health = ProviderHealth()  # Shared by every agent: providers are process-wide
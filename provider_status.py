@@ -0,0 +1,150 @@
+"""
+Provider Status
+Background-refreshed cache of LLM provider availability
+"""
+
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional, Set
+
+
+PROVIDER_REFRESH_INTERVAL = 15  # Seconds between background probes
+API_KEY_PROVIDERS = ("openai", "anthropic")
+
+
+class ProviderStatus:
+    """
+    Last known state of the LLM providers.
+
+    A background task probes Ollama (and re-reads API key env vars) on an
+    interval, off the event loop. Request handlers only read the cached
+    state, so a stopped Ollama never blocks them.
+    """
+
+    def __init__(self, refresh_interval: int = PROVIDER_REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self.ollama_running = False
+        self.ollama_error: Optional[str] = "Not checked yet"
+        self.ollama_models: List[Dict] = []
+        self.ollama_model_names: Set[str] = set()
+        self.ollama_loaded: Dict[str, Dict] = {}  # Models resident in memory, by name
+        self.api_keys: Dict[str, bool] = {}
+        self.checked_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self):
+        """Probe providers once and update the cached state"""
+        try:
+            import ollama
+            response = await asyncio.to_thread(ollama.list)
+            models = [
+                {
+                    "name": m.get('name') or m.get('model'),
+                    "size": m.get('size', 0),
+                    "modified_at": m.get('modified_at', '')
+                }
+                for m in response.get('models', [])
+            ]
+            self.ollama_models = models
+            self.ollama_model_names = self._model_aliases(m['name'] for m in models)
+            self.ollama_loaded = await asyncio.to_thread(self._list_loaded)
+            self.ollama_running = True
+            self.ollama_error = None
+        except Exception as e:
+            self.ollama_running = False
+            self.ollama_error = str(e)
+
+        self.api_keys = {p: bool(os.getenv(f"{p.upper()}_API_KEY")) for p in API_KEY_PROVIDERS}
+        self.checked_at = time.time()
+
+    def _list_loaded(self) -> Dict[str, Dict]:
+        """Models Ollama currently holds in memory (/api/ps)"""
+        try:
+            import ollama
+            if hasattr(ollama, 'ps'):
+                response = ollama.ps()
+            else:
+                # Older clients lack ps(); the server endpoint is the same
+                import httpx
+                host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+                if not host.startswith("http"):
+                    host = f"http://{host}"
+                response = httpx.get(f"{host}/api/ps", timeout=5).json()
+        except Exception as e:
+            print(f"Could not list loaded Ollama models: {e}")
+            return self.ollama_loaded
+
+        loaded = {}
+        for m in response.get('models', []):
+            name = m.get('name') or m.get('model')
+            if not name:
+                continue
+            entry = {
+                "size_vram": m.get('size_vram', 0),
+                "expires_at": str(m.get('expires_at', ''))
+            }
+            for alias in self._model_aliases([name]):
+                loaded[alias] = entry
+        return loaded
+
+    def is_loaded(self, model_name: str) -> bool:
+        """Check whether an Ollama model is resident in memory"""
+        return model_name in self.ollama_loaded
+
+    def mark_loaded(self, model_name: str):
+        """Record a model as resident until the next probe says otherwise"""
+        self.ollama_loaded.setdefault(model_name, {"size_vram": 0, "expires_at": ""})
+
+    def _model_aliases(self, names) -> Set[str]:
+        """Installed model names, plus the bare name for ':latest' tags"""
+        aliases = set()
+        for name in names:
+            aliases.add(name)
+            if name.endswith(':latest'):
+                aliases.add(name[:-len(':latest')])
+        return aliases
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Provider status refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self):
+        """Start refreshing in the background (call from a running event loop)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        """Stop the background refresh"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def has_model(self, model_name: str) -> bool:
+        """Check whether an Ollama model is installed"""
+        return model_name in self.ollama_model_names
+
+    def has_api_key(self, provider: str, project_api_key: Optional[str] = None) -> bool:
+        """Check whether a cloud provider has a key (project key or env var)"""
+        return bool(project_api_key) or self.api_keys.get(provider, False)
+
+    def snapshot(self) -> Dict:
+        """Cached state for API responses"""
+        return {
+            "ollama": {
+                "status": "running" if self.ollama_running else "not_running",
+                "models_available": len(self.ollama_models),
+                "models_loaded": sorted(self.ollama_loaded),
+                "error": self.ollama_error
+            },
+            "api_keys": dict(self.api_keys),
+            "checked_at": self.checked_at
+        }
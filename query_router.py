@@ -0,0 +1,63 @@
+"""
+Query Router
+Cheap heuristics that skip retrieval for small talk and send simple
+questions to a project's fast model
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+FAST_MAX_WORDS = 20  # Longer questions go to the strong model
+FAST_MIN_SCORE = 0.55  # Top search score needed to trust retrieval for a fast answer
+FAST_MAX_HISTORY = 6  # Longer conversations need the strong model's reasoning
+SMALL_TALK_MAX_WORDS = 8  # Longer messages are treated as real questions
+
+# Wording that asks for reasoning, comparison or synthesis rather than a lookup
+COMPLEX_PATTERN = re.compile(
+    r"\b(why|explain|compare|comparison|difference|differences|versus|vs|analy[sz]e|analysis|"
+    r"summari[sz]e|summary|pros|cons|impact|implications?|evaluate|recommend|"
+    r"history of|what if|trade-?offs?|strategy)\b",
+    re.IGNORECASE
+)
+
+# Greetings, thanks, farewells and acknowledgements that need no retrieval
+SMALL_TALK_PATTERN = re.compile(
+    r"(?:\s*\b(?:hi|hello|hey|hiya|howdy|yo|greetings|good (?:morning|afternoon|evening|day)|"
+    r"thanks?(?: (?:so much|a lot))?|thank you(?: (?:so|very) much)?|thx|ty|many thanks|cheers|appreciate it|"
+    r"bye|goodbye|good ?night|see you|see ya|take care|"
+    r"ok(?:ay)?|cool|great|nice|awesome|perfect|got it|sounds good|that helps|"
+    r"how are you(?: doing)?|who are you|what can you do|there|again|all|wow)\b)+",
+    re.IGNORECASE
+)
+
+
+def is_small_talk(message: str) -> bool:
+    """Whether a message is only pleasantries (no question for the knowledge base)"""
+    text = re.sub(r"[^\w\s']", " ", message).strip()
+    if not text or len(text.split()) > SMALL_TALK_MAX_WORDS:
+        return not text
+    return SMALL_TALK_PATTERN.fullmatch(text) is not None
+
+
+def route_query(message: str, search_results: Sequence[Dict],
+                history: Optional[List] = None) -> Tuple[str, str]:
+    """
+    Pick "fast" or "strong" for a question, with the reason. Fast means a
+    short, single lookup-style question with a confident retrieval match.
+    """
+    words = message.split()
+    if len(words) > FAST_MAX_WORDS:
+        return "strong", f"{len(words)} words"
+    if message.count("?") > 1:
+        return "strong", "several questions"
+    match = COMPLEX_PATTERN.search(message)
+    if match:
+        return "strong", f"asks to '{match.group(0).lower()}'"
+    if history and len(history) > FAST_MAX_HISTORY:
+        return "strong", "long conversation"
+
+    top_score = max((r.get('score', 0) for r in search_results), default=0)
+    if top_score < FAST_MIN_SCORE:
+        return "strong", f"top score {top_score:.2f}"
+    return "fast", f"simple lookup, top score {top_score:.2f}"
@@ -0,0 +1,303 @@
+"""
+Resource Manager
+Bounded LRU/idle caches for per-project agents, vector stores and clients
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+
+SWEEP_INTERVAL = 60  # Seconds between idle sweeps
+
+
+class _Entry:
+    __slots__ = ('value', 'last_used', 'pins', 'retired')
+
+    def __init__(self, value: Any):
+        self.value = value
+        self.last_used = time.monotonic()
+        self.pins = 0
+        self.retired = False
+
+
+class ResourceCache:
+    """
+    Dict-like cache holding at most max_entries values, least recently used
+    first out, and dropping values unused for idle_ttl seconds.
+
+    on_evict(key, value) runs when a value leaves the cache, outside the
+    cache lock. Values pinned with use() are never evicted; if one is
+    removed explicitly while pinned, on_evict waits for the last unpin.
+
+    Factories run outside the cache lock, so a slow open only blocks
+    callers of the same key (who wait for that one call's result).
+    """
+
+    def __init__(self, name: str, max_entries: int, idle_ttl: Optional[float] = None,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        self.name = name
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._creating: Dict[Hashable, Future] = {}  # Keys whose factory is running
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any):
+        self.put(key, value)
+
+    def __delitem__(self, key: Hashable):
+        self.pop(key)
+
+    def keys(self) -> List[Hashable]:
+        return list(self._entries.keys())
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value and mark it recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._touch(key, entry)
+            return entry.value
+
+    def put(self, key: Hashable, value: Any):
+        """Add or replace a value, evicting the least recently used if full"""
+        with self._lock:
+            evicted = self._put(key, value)
+        self._run_evictions(evicted)
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Get a value, creating it with factory() on a miss"""
+        entry, evicted = self._get_or_create(key, factory)
+        self._run_evictions(evicted)
+        return entry.value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a value (running on_evict) and return it"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            evicted = self._retire(key, entry) if entry else []
+        self._run_evictions(evicted)
+        return entry.value if entry else default
+
+    def clear(self):
+        for key in self.keys():
+            self.pop(key)
+
+    @contextmanager
+    def use(self, key: Hashable, factory: Optional[Callable[[], Any]] = None) -> Iterator[Any]:
+        """Pin a value (creating it with factory on a miss) for the block"""
+        entry, evicted = self._get_or_create(key, factory, pin=True)
+        self._run_evictions(evicted)
+
+        try:
+            yield entry.value
+        finally:
+            with self._lock:
+                entry.pins -= 1
+                self._touch(key, entry)
+                evicted = [(key, entry)] if entry.retired and entry.pins == 0 else []
+                evicted += self._evict_over_capacity()
+            self._run_evictions(evicted)
+
+    def evict_idle(self) -> int:
+        """Drop values unused for idle_ttl seconds"""
+        if self.idle_ttl is None:
+            return 0
+
+        cutoff = time.monotonic() - self.idle_ttl
+        evicted = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if entry.pins == 0 and entry.last_used < cutoff:
+                    del self._entries[key]
+                    evicted += self._retire(key, entry)
+        self._run_evictions(evicted)
+        return len(evicted)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "idle_ttl": self.idle_ttl,
+                "pinned": sum(1 for e in self._entries.values() if e.pins),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "keys": {str(k): {"idle_seconds": round(now - e.last_used, 1), "pins": e.pins}
+                         for k, e in self._entries.items()}
+            }
+
+    def _put(self, key: Hashable, value: Any) -> List:
+        old = self._entries.get(key)
+        if old is not None and old.value is value:
+            self._touch(key, old)
+            return []
+        self._entries.pop(key, None)
+        self._entries[key] = _Entry(value)
+        evicted = self._retire(key, old) if old else []
+        return evicted + self._evict_over_capacity()
+
+    def _get_or_create(self, key: Hashable, factory: Optional[Callable[[], Any]], pin: bool = False):
+        """
+        Look up an entry, creating it on a miss; returns (entry, evicted).
+        One caller per key runs factory() (outside the lock); the others
+        wait for it and then take its entry.
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self.hits += 1
+                    self._touch(key, entry)
+                    if pin:
+                        entry.pins += 1
+                    return entry, []
+
+                creating = self._creating.get(key)
+                if creating is None:
+                    self.misses += 1
+                    if factory is None:
+                        raise KeyError(key)
+                    creating = self._creating[key] = Future()
+                    break
+
+            creating.result()  # Raises the creator's error; else the entry is in now
+
+        try:
+            value = factory()
+        except BaseException as e:
+            with self._lock:
+                del self._creating[key]
+            creating.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._creating[key]
+            evicted = self._put(key, value)
+            entry = self._entries[key]
+            if pin:
+                entry.pins += 1
+        creating.set_result(None)
+        return entry, evicted
+
+    def _touch(self, key: Hashable, entry: _Entry):
+        entry.last_used = time.monotonic()
+        if self._entries.get(key) is entry:
+            self._entries.move_to_end(key)
+
+    def _retire(self, key: Hashable, entry: _Entry) -> List:
+        """Mark a removed entry; it is evicted now unless still pinned"""
+        entry.retired = True
+        return [(key, entry)] if entry.pins == 0 else []
+
+    def _evict_over_capacity(self) -> List:
+        """Evict least recently used unpinned entries (never the newest)"""
+        evicted = []
+        for key, entry in list(self._entries.items())[:-1]:
+            if len(self._entries) <= self.max_entries:
+                break
+            if entry.pins == 0:
+                del self._entries[key]
+                evicted += self._retire(key, entry)
+        return evicted
+
+    def _run_evictions(self, evicted: List):
+        for key, entry in evicted:
+            self.evictions += 1
+            if self.on_evict:
+                try:
+                    self.on_evict(key, entry.value)
+                except Exception as e:
+                    print(f"Error evicting {self.name} entry {key}: {e}")
+
+
+def process_memory_mb() -> Optional[float]:
+    """Resident memory of this process in MB (Linux), else peak RSS, else None"""
+    try:
+        with open("/proc/self/statm") as f:
+            return round(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024, 1)
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, KB elsewhere
+        return round(peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024, 1)
+    except Exception:
+        return None
+
+
+class ResourceManager:
+    """Registry of ResourceCaches with a background idle sweep"""
+
+    def __init__(self, sweep_interval: int = SWEEP_INTERVAL):
+        self.sweep_interval = sweep_interval
+        self.caches: Dict[str, ResourceCache] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, cache: ResourceCache) -> ResourceCache:
+        self.caches[cache.name] = cache
+        return cache
+
+    def sweep(self) -> int:
+        """Evict idle entries from every cache"""
+        return sum(cache.evict_idle() for cache in self.caches.values())
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                # Evictions close clients, which may touch disk
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                print(f"Resource sweep failed: {e}")
+
+    def start(self):
+        """Start sweeping in the background (call from a running event loop)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self):
+        """Stop the background sweep"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict:
+        return {
+            "memory_mb": process_memory_mb(),
+            "caches": {name: cache.stats() for name, cache in self.caches.items()}
+        }
@@ -0,0 +1,49 @@
+"""
+Single Flight
+Merges identical in-flight requests so the work runs once for all callers
+"""
+
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+def normalize_message(message: str) -> str:
+    """Case- and whitespace-insensitive form of a chat message"""
+    return re.sub(r"[\s?!.]+$", "", " ".join(message.casefold().split()))
+
+
+class SingleFlight:
+    """
+    Runs one call per key at a time; callers arriving while it runs await
+    the same result (or exception) instead of starting their own.
+
+    The call runs as its own task, so a caller that disconnects doesn't
+    cancel it for the others.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0  # Calls actually run
+        self.shared = 0  # Callers served by another caller's call
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() for key, or join the call already running for it"""
+        task = self._calls.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved, in case every caller went away
+
+    def stats(self) -> Dict:
+        return {"in_flight": len(self._calls), "calls": self.calls, "shared": self.shared}
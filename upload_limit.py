@@ -0,0 +1,60 @@
+"""
+Upload Limit
+Rejects oversized request bodies on upload routes before they are spooled to disk
+"""
+
+from typing import Tuple
+
+from fastapi.responses import JSONResponse
+
+
+UPLOAD_OVERHEAD_BYTES = 64 * 1024  # Multipart headers and form fields around the file
+
+
+class UploadSizeLimit:
+    """
+    ASGI middleware capping request bodies for POSTs to paths ending in one
+    of path_suffixes. A Content-Length over the cap gets a 413 before any
+    body is read; a body without one (chunked) gets a 413 as soon as it
+    passes the cap, and the route sees a client disconnect.
+    """
+
+    def __init__(self, app, max_bytes: int, path_suffixes: Tuple[str, ...]):
+        self.app = app
+        self.max_bytes = max_bytes + UPLOAD_OVERHEAD_BYTES
+        self.path_suffixes = path_suffixes
+        self.detail = f"Upload exceeds {max_bytes // (1024 * 1024)}MB limit"
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or scope["method"] != "POST"
+                or not scope["path"].endswith(self.path_suffixes)):
+            await self.app(scope, receive, send)
+            return
+
+        too_large = JSONResponse({"detail": self.detail}, status_code=413)
+        declared = dict(scope["headers"]).get(b"content-length")
+        if declared and declared.isdigit() and int(declared) > self.max_bytes:
+            await too_large(scope, receive, send)
+            return
+
+        received = 0
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    rejected = True
+                    await too_large(scope, receive, send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            if not rejected:  # The route's own response comes after our 413
+                await send(message)
+
+        await self.app(scope, limited_receive, guarded_send)
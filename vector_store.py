@@ -4,33 +4,159 @@ Handles embeddings and vector search using Qdrant
 """
 
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
+from qdrant_client.models import Distance, VectorParams, PointStruct, PayloadSchemaType
 from sentence_transformers import SentenceTransformer
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator, Set, Tuple
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
 import uuid
 import hashlib
+import threading
+import warnings
 
+from resource_manager import ResourceCache
 
-# Global Qdrant client cache to avoid file locking issues
-_qdrant_clients: Dict[str, QdrantClient] = {}
+
+MAX_QDRANT_CLIENTS = 16
+QDRANT_CLIENT_IDLE_TTL = 600  # Seconds before an unused client is closed
+
+
+class SerializedQdrantClient:
+    """
+    A local (path) QdrantClient whose calls all run on one dedicated thread.
+
+    Local mode keeps its data in SQLite and in-memory arrays that are not
+    thread-safe, and the SQLite connection may refuse use from any thread
+    but its creator. Ingestion workers, chats and the idle sweep all share
+    one client per path, so the client is created on, and only ever used
+    from, its own single-thread executor.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qdrant")
+        self._thread_id: Optional[int] = None
+        self._client: Optional[QdrantClient] = None
+        self._client = self._executor.submit(self._create).result()
+
+    def _create(self) -> QdrantClient:
+        self._thread_id = threading.get_ident()
+        return QdrantClient(path=self.path)
+
+    def _run(self, fn, *args, **kwargs):
+        if threading.get_ident() == self._thread_id:
+            return fn(*args, **kwargs)
+        return self._executor.submit(fn, *args, **kwargs).result()
+
+    def __getattr__(self, name: str):
+        if self.__dict__.get('_client') is None:
+            raise AttributeError(f"Qdrant client for {self.path} is closed")
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            return self._run(attr, *args, **kwargs)
+        return call
+
+    def _close(self):
+        if self._client is not None:
+            self._client.close()
+            # Drop it here so its finalizer also runs on this thread
+            self._client = None
+
+    def close(self):
+        try:
+            self._run(self._close)
+        finally:
+            self._executor.shutdown(wait=False)
+
+
+def _close_qdrant_client(path: str, client: SerializedQdrantClient):
+    client.close()
+    _indexed_collections.difference_update({k for k in _indexed_collections if k[0] == id(client)})
+
+
+# Shared Qdrant clients, one per path (each holds the path's file lock).
+# Clients in use by a VectorStore are pinned; others are closed when idle.
+qdrant_clients = ResourceCache(
+    "qdrant_clients", MAX_QDRANT_CLIENTS, QDRANT_CLIENT_IDLE_TTL, on_evict=_close_qdrant_client
+)
+
+
+def get_qdrant_client(path: str) -> SerializedQdrantClient:
+    """Get the shared client for a Qdrant path (one per path holds the file lock)"""
+    return qdrant_clients.get_or_create(path, lambda: SerializedQdrantClient(path))
+
+
+def close_qdrant_client(path: str):
+    """Close a path's client (once no VectorStore is using it)"""
+    qdrant_clients.pop(path)
+
+
+# Embedding models are shared by every VectorStore
+_encoders: Dict[str, SentenceTransformer] = {}
+_encoders_lock = threading.Lock()
+
+
+def get_encoder(model_name: str = 'all-MiniLM-L6-v2') -> SentenceTransformer:
+    """Get the shared embedding model"""
+    with _encoders_lock:
+        if model_name not in _encoders:
+            _encoders[model_name] = SentenceTransformer(model_name)
+        return _encoders[model_name]
+
+
+# Payload fields the document browser filters on
+INDEXED_PAYLOAD_FIELDS = {
+    'source': PayloadSchemaType.KEYWORD,
+    'source_type': PayloadSchemaType.KEYWORD,
+    'date': PayloadSchemaType.DATETIME,
+}
+_indexed_collections: Set[Tuple[int, str]] = set()
+
+
+def ensure_payload_indexes(client: QdrantClient, collection_name: str):
+    """Create the browser's payload indexes once per client and collection"""
+    key = (id(client), collection_name)
+    if key in _indexed_collections:
+        return
+
+    # Local (path) mode accepts but ignores indexes and warns on each call;
+    # they take effect when the collection is served by a Qdrant server
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for field_name, schema in INDEXED_PAYLOAD_FIELDS.items():
+            try:
+                client.create_payload_index(collection_name, field_name=field_name, field_schema=schema)
+            except Exception as e:
+                print(f"Could not index payload field {field_name}: {e}")
+    _indexed_collections.add(key)
 
 
 class VectorStore:
     """Manages vector embeddings and semantic search"""
 
     def __init__(self, path: str = "./qdrant_data", collection_name: str = "neighborhood_knowledge"):
-        # Use shared client for the same path to avoid locking issues
-        if path not in _qdrant_clients:
-            _qdrant_clients[path] = QdrantClient(path=path)
-        self.client = _qdrant_clients[path]
+        # Use shared client for the same path to avoid locking issues,
+        # pinned until close() so it is not evicted while in use
+        self._resources = ExitStack()
+        self.client = self._resources.enter_context(
+            qdrant_clients.use(path, lambda: SerializedQdrantClient(path))
+        )
 
         self.collection_name = collection_name
-        self.encoder = SentenceTransformer('all-MiniLM-L6-v2')  # 384 dimensions
+        self.encoder = get_encoder('all-MiniLM-L6-v2')  # 384 dimensions
         self.vector_size = 384
 
         # Create collection if it doesn't exist
         self._ensure_collection_exists()
+        ensure_payload_indexes(self.client, self.collection_name)
     
+    def close(self):
+        """Release the shared Qdrant client"""
+        self._resources.close()
+
     def _ensure_collection_exists(self):
         """Create collection if it doesn't exist"""
         try:
@@ -197,6 +323,46 @@ class VectorStore:
         
         return chunks
 
+    def chunk_pages(self, pages: Iterable[Dict], chunk_size: int = 500, overlap: int = 50) -> Iterator[Dict]:
+        """
+        Split a stream of page dicts into overlapping chunks tagged with
+        page_start/page_end.
+
+        Windows match chunk_text over the concatenated pages, but only about
+        one chunk of words is buffered at a time.
+        """
+        step = chunk_size - overlap
+        words: List[str] = []
+        page_numbers: List[int] = []
+
+        def window() -> Optional[Dict]:
+            if len(words[:chunk_size]) <= 50:  # Only keep substantial chunks
+                return None
+            return {
+                'text': ' '.join(words[:chunk_size]),
+                'page_start': page_numbers[0],
+                'page_end': page_numbers[:chunk_size][-1]
+            }
+
+        for page in pages:
+            page_words = page['text'].split()
+            words.extend(page_words)
+            page_numbers.extend([page['page_number']] * len(page_words))
+
+            while len(words) >= chunk_size:
+                chunk = window()
+                if chunk:
+                    yield chunk
+                del words[:step]
+                del page_numbers[:step]
+
+        while words:
+            chunk = window()
+            if chunk:
+                yield chunk
+            del words[:step]
+            del page_numbers[:step]
+
 
 # Example usage
 if __name__ == "__main__":